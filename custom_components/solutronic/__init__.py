@@ -1,8 +1,24 @@
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    DATA_HUB,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    MAX_POLL_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    DEFAULT_SAMPLE_INTERVAL,
+    CONF_RECORD_PAGES,
+    DEFAULT_RECORD_PAGES,
+    PAGE_LOG_DIR,
+    STORAGE_VERSION,
+)
 from .coordinator import SolutronicDataUpdateCoordinator
+from .hub import async_get_hub
 
 
 async def async_setup(hass: HomeAssistant, config: dict):
@@ -11,9 +27,12 @@ async def async_setup(hass: HomeAssistant, config: dict):
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
-    """Reload the integration when options (e.g. scan_interval) are changed."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Reload the integration when options (e.g. polling intervals) are changed."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and coordinator.options == entry.options:
+        return  # Only entry.data changed (device metadata, IP); the live coordinator has it
+    # Through HA so the entry's unload callbacks (tasks, listeners, page log) run
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
@@ -22,15 +41,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     # Get IP stored from config flow
     ip = entry.data["ip_address"]
 
-    # Read polling interval from integration options UI
-    scan_interval = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
-
-    # Create the data coordinator with dynamic interval
-    coordinator = SolutronicDataUpdateCoordinator(hass, ip, scan_interval, entry)
-    await coordinator.async_config_entry_first_refresh()
+    # Read adaptive polling bounds from integration options UI
+    # (older entries only have the fixed "scan_interval" option, and may
+    # hold intervals above the current limit)
+    min_interval = min(
+        entry.options.get(CONF_MIN_INTERVAL, entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)),
+        MAX_POLL_INTERVAL,
+    )
+    max_interval = min(entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL), MAX_POLL_INTERVAL)
+    sample_interval = entry.options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+
+    # All inverters share one hub (session, concurrency cap, staggered polling)
+    hub = async_get_hub(hass)
+
+    # Create the data coordinator with adaptive interval
+    coordinator = SolutronicDataUpdateCoordinator(
+        hass, ip, min_interval, entry, hub, max_interval=max_interval, sample_interval=sample_interval
+    )
+    hub.async_register(entry.entry_id, coordinator)
+
+    # Optional raw page recorder (imported only when enabled)
+    if entry.options.get(CONF_RECORD_PAGES, DEFAULT_RECORD_PAGES):
+        from .pagelog import PageLog
+
+        coordinator.page_log = PageLog(hass, hass.config.path(PAGE_LOG_DIR), entry.entry_id)
+        coordinator.page_log.async_start()
+        entry.async_on_unload(coordinator.page_log.async_close)
+
+    # Restore the last snapshot instead of waiting for the inverter; the first
+    # live refresh runs in the background so setup never blocks on the network
+    await coordinator.async_restore()
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+    )
+
+    # High-rate sampling runs for the lifetime of the entry (cancelled on unload)
+    if coordinator.sampler is not None:
+        entry.async_create_background_task(
+            hass, coordinator.sampler.async_run(), f"{DOMAIN} sampler {entry.entry_id}"
+        )
 
     # Store coordinator instance
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = coordinator
 
     # Forward setup to sensor platform(s)
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
@@ -46,4 +98,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
-    return unload_ok
\ No newline at end of file
+        await hass.data[DOMAIN][DATA_HUB].async_unregister(entry.entry_id)
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Delete the persisted snapshot when the integration is removed."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
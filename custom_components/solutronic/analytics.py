@@ -0,0 +1,193 @@
+"""Streaming analytics updated from each poll in constant time and memory.
+
+Per-string DC power and phase imbalance come straight from the sample. The
+rolling statistics of PAC_TOTAL are kept incrementally instead of being
+queried from recorder history:
+
+- a time-aware EWMA mean/standard deviation (polls are not evenly spaced),
+- today's time-weighted mean/standard deviation (weighted Welford update),
+- min/max over the last hour from a fixed ring of time buckets.
+"""
+
+import math
+
+from .energy import MAX_GAP
+
+# Time constant of the rolling PAC mean/stddev
+PAC_TIME_CONSTANT = 300  # seconds
+# Rolling min/max window, kept as this many buckets (memory does not grow with the poll rate)
+EXTREMES_WINDOW = 3600  # seconds
+EXTREMES_BUCKETS = 12
+# Phase imbalance is not reported below this average power per phase (dawn/dusk noise)
+IMBALANCE_MIN_POWER = 50  # W
+
+PHASE_KEYS = ("PACL1", "PACL2", "PACL3")
+STRING_KEYS = (("PDC1", "UDC1", "IDC1"), ("PDC2", "UDC2", "IDC2"), ("PDC3", "UDC3", "IDC3"))
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) else None
+
+
+class Ewma:
+    """Exponentially weighted mean and variance for irregularly spaced samples."""
+
+    def __init__(self, time_constant, state=None):
+        state = state or {}
+        self.time_constant = time_constant
+        self.mean = state.get("mean")
+        self.variance = state.get("variance", 0.0)
+
+    def add(self, value, elapsed):
+        """Add a sample taken elapsed seconds after the previous one."""
+        if self.mean is None or elapsed > MAX_GAP:
+            # First sample or after an outage: start over from this value
+            self.mean, self.variance = value, 0.0
+            return
+        alpha = 1 - math.exp(-elapsed / self.time_constant)
+        diff = value - self.mean
+        increment = alpha * diff
+        self.mean += increment
+        self.variance = (1 - alpha) * (self.variance + diff * increment)
+
+    @property
+    def stddev(self):
+        return math.sqrt(max(self.variance, 0.0))
+
+    def as_dict(self):
+        return {"mean": self.mean, "variance": self.variance}
+
+
+class WeightedStats:
+    """Weighted running mean and variance (West's variant of Welford's algorithm)."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.weight = state.get("weight", 0.0)
+        self.mean = state.get("mean", 0.0)
+        self._m2 = state.get("m2", 0.0)
+
+    def add(self, value, weight):
+        if weight <= 0:
+            return
+        self.weight += weight
+        delta = value - self.mean
+        self.mean += delta * weight / self.weight
+        self._m2 += weight * delta * (value - self.mean)
+
+    @property
+    def stddev(self):
+        return math.sqrt(max(self._m2 / self.weight, 0.0)) if self.weight else None
+
+    def as_dict(self):
+        return {"weight": self.weight, "mean": self.mean, "m2": self._m2}
+
+
+class WindowedExtremes:
+    """Min/max over a sliding time window, from a fixed ring of time buckets.
+
+    The window slides in bucket steps, so it covers between window - span and
+    window seconds.
+    """
+
+    def __init__(self, window=EXTREMES_WINDOW, buckets=EXTREMES_BUCKETS, state=None):
+        self.span = window / buckets
+        self._buckets = [None] * buckets  # [bucket number, min, max]
+        for bucket in state or ():
+            if bucket is not None:
+                self._buckets[bucket[0] % buckets] = list(bucket)
+
+    def add(self, timestamp, value):
+        number = int(timestamp // self.span)
+        slot = number % len(self._buckets)
+        bucket = self._buckets[slot]
+        if bucket is None or bucket[0] != number:
+            self._buckets[slot] = [number, value, value]
+        elif value < bucket[1]:
+            bucket[1] = value
+        elif value > bucket[2]:
+            bucket[2] = value
+
+    def extremes(self, timestamp):
+        """Return (min, max) over the window ending at timestamp, or (None, None)."""
+        oldest = int(timestamp // self.span) - len(self._buckets) + 1
+        live = [bucket for bucket in self._buckets if bucket is not None and bucket[0] >= oldest]
+        if not live:
+            return None, None
+        return min(bucket[1] for bucket in live), max(bucket[2] for bucket in live)
+
+    def as_dict(self):
+        return [bucket for bucket in self._buckets if bucket is not None]
+
+
+class StreamingAnalytics:
+    """Derived power values and rolling PAC statistics for one inverter."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.ewma = Ewma(PAC_TIME_CONSTANT, state.get("ewma"))
+        self.today = WeightedStats(state.get("today"))
+        self.extremes = WindowedExtremes(state=state.get("extremes"))
+        self._last_time = state.get("last_time")  # wall-clock, so the window survives restarts
+        self._prev_et = state.get("prev_et")
+
+    def as_dict(self):
+        """Return the state worth persisting across restarts."""
+        return {
+            "ewma": self.ewma.as_dict(),
+            "today": self.today.as_dict(),
+            "extremes": self.extremes.as_dict(),
+            "last_time": self._last_time,
+            "prev_et": self._prev_et,
+        }
+
+    def update(self, data, now):
+        """Feed one poll (timestamp now) and return {key: value} and {key: attributes}."""
+        values = {}
+
+        # --- Per-string DC power ---
+        for key, voltage_key, current_key in STRING_KEYS:
+            voltage, current = _number(data.get(voltage_key)), _number(data.get(current_key))
+            if voltage is not None and current is not None:
+                values[key] = round(voltage * current, 1)
+
+        # --- Phase imbalance: largest deviation from the phase average, in % ---
+        phases = [value for value in map(_number, map(data.get, PHASE_KEYS)) if value is not None]
+        if len(phases) >= 2:
+            average = sum(phases) / len(phases)
+            imbalance = None
+            if average >= IMBALANCE_MIN_POWER:
+                imbalance = round(max(abs(value - average) for value in phases) / average * 100, 1)
+            values["PHASE_IMBALANCE"] = imbalance
+
+        # --- Rolling PAC statistics ---
+        pac = _number(data.get("PAC_TOTAL"))
+        if pac is None:
+            return values, {}
+
+        # Today's statistics restart when ET resets (the inverter's own day)
+        et = _number(data.get("ET"))
+        if et is not None:
+            if self._prev_et is not None and et < self._prev_et:
+                self.today = WeightedStats()
+            self._prev_et = et
+
+        elapsed = now - self._last_time if self._last_time is not None else None
+        self._last_time = now
+        self.ewma.add(pac, elapsed if elapsed is not None else math.inf)
+        if elapsed is not None and 0 < elapsed <= MAX_GAP:
+            self.today.add(pac, elapsed)
+        self.extremes.add(now, pac)
+
+        values["PAC_MEAN"] = round(self.ewma.mean, 1)
+        values["PAC_STDDEV"] = round(self.ewma.stddev, 1)
+
+        low, high = self.extremes.extremes(now)
+        today_stddev = self.today.stddev
+        attributes = {
+            "min_1h": round(low, 1),
+            "max_1h": round(high, 1),
+            "mean_today": round(self.today.mean, 1) if self.today.weight else None,
+            "stddev_today": round(today_stddev, 1) if today_stddev is not None else None,
+        }
+        return values, {"PAC_MEAN": attributes, "PAC_STDDEV": attributes}
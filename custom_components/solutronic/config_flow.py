@@ -3,8 +3,39 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 
-from .const import DOMAIN, CONF_IP_ADDRESS, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    CONF_IP_ADDRESS,
+    CONF_MAC,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    MAX_POLL_INTERVAL,
+    DEFAULT_ALIGN_TO_CLOCK,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    CONF_ALIGN_TO_CLOCK,
+    CONF_DEADBAND_VOLTAGE,
+    CONF_DEADBAND_CURRENT,
+    CONF_DEADBAND_POWER,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_MAX_PUBLISH_AGE,
+    CONF_SAMPLE_INTERVAL,
+    CONF_CACHE_TTL,
+    CONF_RECORD_PAGES,
+    CONF_LONG_TERM_STATISTICS,
+    DEFAULT_DEADBAND_VOLTAGE,
+    DEFAULT_DEADBAND_CURRENT,
+    DEFAULT_DEADBAND_POWER,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_MAX_PUBLISH_AGE,
+    DEFAULT_SAMPLE_INTERVAL,
+    MIN_SAMPLE_INTERVAL,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_RECORD_PAGES,
+    DEFAULT_LONG_TERM_STATISTICS,
+)
 from .coordinator import SolutronicDataUpdateCoordinator
+from .solutronic_api import async_get_mac
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,10 +67,15 @@ class SolutronicInverterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except Exception:
                 errors["base"] = "cannot_connect"
             else:
-                return self.async_create_entry(
-                    title="Solutronic",
-                    data={CONF_IP_ADDRESS: ip},
-                )
+                # The endpoint found during validation stays cached for setup
+                data = {CONF_IP_ADDRESS: ip}
+
+                # The MAC lets the integration find the inverter again after a DHCP move
+                mac = await async_get_mac(ip, self.hass)
+                if mac is not None:
+                    data[CONF_MAC] = mac
+
+                return self.async_create_entry(title="Solutronic", data=data)
 
         # Show input form
         schema = vol.Schema({
@@ -55,20 +91,87 @@ class SolutronicInverterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 class SolutronicInverterOptionsFlow(config_entries.OptionsFlow):
-    """Allows changing scan interval in options."""
+    """Allows changing polling bounds and the publishing policy in options."""
 
     def __init__(self, config_entry):
         self.config_entry = config_entry
 
     async def async_step_init(self, user_input=None):
+        errors = {}
+        options = self.config_entry.options
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            sample_interval = user_input.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval"
+            elif sample_interval and not MIN_SAMPLE_INTERVAL <= sample_interval < user_input[CONF_MIN_INTERVAL]:
+                # Sampling only makes sense between polls, and must not hammer the inverter
+                errors["base"] = "invalid_sample_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         schema = vol.Schema({
             vol.Optional(
-                "scan_interval",
-                default=self.config_entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
-            ): vol.In([5, 10, 30])
+                CONF_MIN_INTERVAL,
+                default=min(
+                    options.get(CONF_MIN_INTERVAL, options.get("scan_interval", DEFAULT_SCAN_INTERVAL)),
+                    MAX_POLL_INTERVAL,
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=MAX_POLL_INTERVAL)),
+            vol.Optional(
+                CONF_MAX_INTERVAL,
+                default=min(options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL), MAX_POLL_INTERVAL)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=MAX_POLL_INTERVAL)),
+            vol.Optional(
+                CONF_ALIGN_TO_CLOCK,
+                default=options.get(CONF_ALIGN_TO_CLOCK, DEFAULT_ALIGN_TO_CLOCK)
+            ): bool,
+
+            # Publishing policy for jittery measurements (energy keys are never filtered)
+            vol.Optional(
+                CONF_DEADBAND_VOLTAGE,
+                default=options.get(CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DEADBAND_CURRENT,
+                default=options.get(CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_DEADBAND_POWER,
+                default=options.get(CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+            vol.Optional(
+                CONF_MIN_PUBLISH_INTERVAL,
+                default=options.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_MAX_PUBLISH_AGE,
+                default=options.get(CONF_MAX_PUBLISH_AGE, DEFAULT_MAX_PUBLISH_AGE)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=86400)),
+
+            # High-rate internal sampling published as mean/min/max attributes (0 = off)
+            vol.Optional(
+                CONF_SAMPLE_INTERVAL,
+                default=options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+
+            # Pages fetched within this many seconds are reused instead of fetched again
+            vol.Optional(
+                CONF_CACHE_TTL,
+                default=options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+
+            # Record raw pages for debugging (compressed, size-capped, under the config dir)
+            vol.Optional(
+                CONF_RECORD_PAGES,
+                default=options.get(CONF_RECORD_PAGES, DEFAULT_RECORD_PAGES)
+            ): bool,
+
+            # Hourly power/energy statistics written in bulk, with outages backfilled from ET/EG
+            vol.Optional(
+                CONF_LONG_TERM_STATISTICS,
+                default=options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS)
+            ): bool,
         })
 
-        return self.async_show_form(step_id="init", data_schema=schema)
\ No newline at end of file
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
@@ -3,4 +3,71 @@
 DOMAIN = "solutronic"
 CONF_IP_ADDRESS = "ip_address"
 DEFAULT_SCAN_INTERVAL = 5  # in seconds
-KEY_LIFETIME_DERIVED = "LIFETIME_DERIVED"
\ No newline at end of file
+
+# Adaptive polling: interval moves between min and max depending on PAC activity
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+DEFAULT_MAX_INTERVAL = 60  # in seconds
+NIGHT_INTERVAL = 300  # wake-up probe while the sun is down and the inverter is dark
+# Upper bound for both polling options. Keep it well below energy.MAX_GAP (600 s):
+# a gap longer than that is treated as an outage and not integrated.
+MAX_POLL_INTERVAL = 300  # in seconds
+PAC_CHANGE_THRESHOLD = 0.05  # relative PAC change that counts as "changing quickly"
+PAC_CHANGE_FLOOR = 100  # W; small outputs are compared against this instead
+KEY_LIFETIME_DERIVED = "LIFETIME_DERIVED"
+KEY_LIFETIME_INTEGRATED = "LIFETIME_INTEGRATED"
+# Key in coordinator data holding {key: {mean, min, max, last, samples}} from the sampler
+KEY_AGGREGATES = "AGGREGATES"
+# Key in coordinator data holding {key: attributes} from the streaming analytics
+KEY_STATISTICS = "STATISTICS"
+
+# Publishing policy (options): deadbands per quantity and publish rate limits
+CONF_DEADBAND_VOLTAGE = "deadband_voltage"  # V, absolute
+CONF_DEADBAND_CURRENT = "deadband_current"  # A, absolute
+CONF_DEADBAND_POWER = "deadband_power"  # %, relative to the last published value
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"  # seconds between publishes
+CONF_MAX_PUBLISH_AGE = "max_publish_age"  # seconds before a pending change is forced out
+DEFAULT_DEADBAND_VOLTAGE = 0.5
+DEFAULT_DEADBAND_CURRENT = 0.05
+DEFAULT_DEADBAND_POWER = 1.0
+DEFAULT_MIN_PUBLISH_INTERVAL = 0
+DEFAULT_MAX_PUBLISH_AGE = 300
+
+# High-rate internal sampling (0 disables); aggregates are published per update
+CONF_SAMPLE_INTERVAL = "sample_interval"
+DEFAULT_SAMPLE_INTERVAL = 0  # seconds
+MIN_SAMPLE_INTERVAL = 1  # seconds; the sample interval must also stay below the poll interval
+
+# How old a page fetched by another caller (sampler, config flow) may be and
+# still answer a poll instead of a new request
+CONF_CACHE_TTL = "cache_ttl"
+DEFAULT_CACHE_TTL = 1.0  # seconds
+
+# Record raw pages to <config>/PAGE_LOG_DIR for debugging and replay (see pagelog.py)
+CONF_RECORD_PAGES = "record_pages"
+DEFAULT_RECORD_PAGES = False
+PAGE_LOG_DIR = "solutronic_pages"
+
+# Poll (and sample) on wall-clock boundaries, e.g. every 5 s on the :00/:05 marks
+CONF_ALIGN_TO_CLOCK = "align_to_clock"
+DEFAULT_ALIGN_TO_CLOCK = False
+
+# Hourly power/energy statistics written in bulk to the recorder, with outage backfill
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+DEFAULT_LONG_TERM_STATISTICS = False
+
+# Pages in a row that must report the same keys before entities for keys the
+# inverter never reported are removed (a truncated first page must not do it)
+REPORTED_KEYS_CONFIRMATIONS = 3
+
+# Persisted snapshot of the last data and lifetime counter state
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds; saves are debounced
+
+# Key in hass.data[DOMAIN] holding the shared SolutronicHub
+DATA_HUB = "hub"
+
+# MAC-anchored IP recovery after a DHCP move
+CONF_MAC = "mac"
+RECOVERY_SCAN_PREFIX = 24  # targeted scan covers this block around the last known IP
+RECOVERY_SCAN_INTERVAL = 1800  # seconds between targeted scans (the inverter is off at night)
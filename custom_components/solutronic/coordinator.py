@@ -1,37 +1,165 @@
+import importlib
 import logging
+import time
+from contextlib import aclosing, nullcontext
 from datetime import timedelta
 
+from homeassistant.helpers import event
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.sun import is_up
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .solutronic_api import async_get_sensor_data, async_get_raw_html, async_get_mac
-from .discovery import discover_solutronic  # used for auto-reconnect scan
+
+from .const import (
+    CONF_ALIGN_TO_CLOCK,
+    CONF_CACHE_TTL,
+    CONF_IP_ADDRESS,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAC,
+    DEFAULT_ALIGN_TO_CLOCK,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DOMAIN,
+    KEY_AGGREGATES,
+    KEY_LIFETIME_INTEGRATED,
+    KEY_STATISTICS,
+    MIN_SAMPLE_INTERVAL,
+    NIGHT_INTERVAL,
+    PAC_CHANGE_FLOOR,
+    PAC_CHANGE_THRESHOLD,
+    RECOVERY_SCAN_INTERVAL,
+    RECOVERY_SCAN_PREFIX,
+    REPORTED_KEYS_CONFIRMATIONS,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .analytics import StreamingAnalytics
+from .energy import PowerIntegrator
+from .metrics import metrics_for
+from .sampling import SolutronicSampler, next_tick
+from .sensor import SENSORS
+from .solutronic_api import (
+    CircuitBreaker,
+    CircuitOpenError,
+    InverterPage,
+    async_get_sensor_data,
+    async_get_inverter_data,
+    async_get_mac,
+    breaker_for,
+    forget_host,
+    get_cached_base_url,
+    parse_device_metadata,
+    raise_if_circuit_open,
+    seed_base_url,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Table rows the integration uses; the rest of the page is never converted
+TABLE_KEYS = frozenset(SENSORS) | {"SN"}
+
 
 class SolutronicDataUpdateCoordinator(DataUpdateCoordinator):
     """Coordinator that polls the Solutronic inverter and provides stable data."""
 
-    def __init__(self, hass, ip_address, scan_interval, entry=None):
+    def __init__(
+        self, hass, ip_address, scan_interval, entry=None, hub=None, max_interval=None, sample_interval=0
+    ):
         # Initialize coordinator with dynamic polling interval
         super().__init__(
             hass,
             _LOGGER,
             name="Solutronic",
             update_interval=timedelta(seconds=scan_interval),
+            # Only notify entities when the returned data actually differs
+            always_update=False,
         )
 
         self.ip_address = ip_address
         self.hass = hass
         self.entry = entry
+        self.options = dict(entry.options) if entry is not None else {}  # options this coordinator was built with
+        self.hub = hub  # Shared session / concurrency cap when running under the hub
+        self.phase = 0.0  # Fraction of the update interval this inverter is offset by
         self._last_data = None  # Store last known valid data for fallback
+        self._last_fingerprint = None  # Fingerprint of the last successfully parsed page
+        self._last_header = None  # (raw metadata header, serial) from the previous poll
+        self.reported_keys = None  # Every table key this inverter has reported (None until known)
+        self.reported_keys_confirmed = False  # reported_keys seen on enough pages in a row
+        self._reported_streak = 0
+
+        # Adaptive polling bounds (equal bounds give a fixed interval)
+        self.min_interval = scan_interval
+        self.max_interval = max(max_interval or scan_interval, scan_interval)
+        self._prev_pac = None
+
+        # Raw page recorder (pagelog.PageLog), set up by the entry when enabled
+        self.page_log = None
+
+        # Optional high-rate sampler; its aggregates are published with each update
+        # (options saved before the interval was validated may be out of range)
+        if sample_interval and not MIN_SAMPLE_INTERVAL <= sample_interval < scan_interval:
+            _LOGGER.warning(
+                "Solutronic (%s): sample interval %ss must be at least %ss and below the poll interval %ss; "
+                "sampling disabled",
+                ip_address, sample_interval, MIN_SAMPLE_INTERVAL, scan_interval,
+            )
+            sample_interval = 0
+        self.sampler = SolutronicSampler(self, sample_interval) if sample_interval else None
+        self._last_publish = time.monotonic()
+
+        # Reuse pages up to this old; never longer than half a poll or sample interval
+        self.cache_ttl = entry.options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL) if entry is not None else 0
+        self.cache_ttl = min(self.cache_ttl, self.min_interval / 2)
+        if self.sampler is not None:
+            self.cache_ttl = min(self.cache_ttl, sample_interval / 2)
+
+        # Poll on wall-clock boundaries instead of the hub's phase slots
+        self.align_to_clock = (
+            entry.options.get(CONF_ALIGN_TO_CLOCK, DEFAULT_ALIGN_TO_CLOCK) if entry is not None else False
+        )
+        self._scheduled_at = None  # wall-clock time the pending scheduled poll is due
+        self._scheduled_interval = None
 
         # Lifetime counter internal state
         self._lt_prev_et = None
         self._lt_total = None
 
+        # Power-integrated lifetime counter (restored from the snapshot)
+        self.integrator = PowerIntegrator()
+
+        # Per-string power, phase imbalance and rolling PAC statistics (restored too)
+        self.analytics = StreamingAnalytics()
+
+        # Hourly statistics written in bulk to the recorder (restored too)
+        self.long_term = None
+        if entry is not None and entry.options.get(CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS):
+            self.long_term = self._long_term_statistics()
+
+        # Snapshot of the above, persisted so restarts resume where we left off
+        self._store = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}") if entry is not None else None
+        )
+        self._snapshot_save_due = 0.0  # monotonic time the pending delayed save fires
+
+        # State writes held back by the sensors' publishing policy
+        self.suppressed_writes = 0
+
+        # Per-stage latency histograms and counters (shared with the API layer)
+        self.metrics = metrics_for(ip_address)
+
         # Used to avoid repeating bridge-mode warning log
         self._bridge_warning_logged = False
 
+        # IP recovery by MAC (see _async_recover); the MAC found by the config
+        # flow is in the entry, a learned one is kept in the snapshot
+        self.mac = entry.data.get(CONF_MAC) if entry is not None else None
+        self._recovery_task = None
+        self._next_recovery_scan = 0.0
+
+        # Working endpoint and its expiry, persisted in the snapshot (not the entry:
+        # writing entry.data on every reprobe would notify its update listeners)
+        self._base_url = None
+
         # Device metadata (persisted in config entry when available)
         if entry is not None:
             self.device_manufacturer = entry.data.get("manufacturer", "Solutronic")
@@ -46,9 +174,45 @@ class SolutronicDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Fetch data and return fallback data if device is temporarily unreachable."""
+        self.metrics.increment("polls")
+        with self.metrics.time("update"):
+            return await self._async_poll()
+
+    async def _async_poll(self):
+        """Run one poll: fetch, post-process, or build the offline fallback."""
         try:
-            # Request data from the inverter (parsed sensor values)
-            data = await async_get_sensor_data(self.ip_address, self.hass)
+            # Request telemetry and metadata header from a single page fetch
+            page = await self._async_fetch()
+            postprocess_started = time.perf_counter()
+
+            # --- Unchanged page: skip parsing; only time-dependent values move on ---
+            if page.data is None:
+                data = self._last_data
+                self._adapt_interval(data.get("PAC_TOTAL"))
+                if self.sampler is not None:
+                    data = self._with_aggregates(data)
+                integrated = self._integrate_power(data)
+                if integrated != data.get(KEY_LIFETIME_INTEGRATED):
+                    data = {**data, KEY_LIFETIME_INTEGRATED: integrated}
+                    self._schedule_snapshot_save()
+                # The reading still holds, so the rolling statistics move on with time
+                data = self._with_analytics(data)
+                if self.long_term is not None:
+                    self.long_term.add_sample(time.time(), data)
+                self._last_data = data
+                self.metrics.observe("postprocess", (time.perf_counter() - postprocess_started) * 1000)
+                return data
+
+            data, header = page.data, page.header
+
+            # --- Remember which keys this model reports (entities follow this) ---
+            keys = frozenset(data)
+            if self.reported_keys is None or not keys <= self.reported_keys:
+                self.reported_keys = keys | (self.reported_keys or frozenset())
+            # Entities are only removed once the key set has been stable for a while
+            self._reported_streak = self._reported_streak + 1 if keys == self.reported_keys else 0
+            if self._reported_streak >= REPORTED_KEYS_CONFIRMATIONS:
+                self.reported_keys_confirmed = True
 
             # --- Extract serial number (SN) and ensure no decimal formatting ---
             sn = data.get("SN")
@@ -64,47 +228,20 @@ class SolutronicDataUpdateCoordinator(DataUpdateCoordinator):
             # --- Normalize stored IP address (ensure it's clean and exact) ---
             self.device_ip = self.ip_address
 
-            # --- Parse device metadata from raw HTML ---
-            try:
-                html = await async_get_raw_html(self.ip_address, self.hass)
-
-                manufacturer_new = self.device_manufacturer
-                model_new = self.device_model
-                firmware_new = self.device_firmware
-
-                # Extract manufacturer and model from <h1> header
-                if "<h1>" in html:
-                    header = html.split("<h1>")[1].split("</h1>")[0]
-                    parts = [line.strip() for line in header.replace("<br>", "\n").split("\n") if line.strip()]
-                    if len(parts) >= 2:
-                        model_new = parts[0]
-                        manufacturer_new = parts[1]
-
-                # Extract firmware version
-                if "FW-Release" in html:
-                    fw_line = html.split("FW-Release:")[1].split("<")[0].strip()
-                    if fw_line:
-                        firmware_new = fw_line
-
-                # Apply parsed metadata
-                self.device_manufacturer = manufacturer_new
-                self.device_model = model_new
-                self.device_firmware = firmware_new
-
-                # Persist metadata so it survives inverter offline periods and HA restarts
-                if self.entry is not None:
-                    new_data = dict(self.entry.data)
-                    new_data["manufacturer"] = self.device_manufacturer
-                    new_data["model"] = self.device_model
-                    new_data["firmware"] = self.device_firmware
-                    new_data["serial"] = getattr(self, "device_serial", None)
-
-                    if new_data != self.entry.data:
-                        self.hass.config_entries.async_update_entry(self.entry, data=new_data)
+            # --- Parse device metadata only when the page header (or serial) changed ---
+            marker = (header, self.device_serial)
+            if marker != self._last_header:
+                try:
+                    self._apply_metadata(header)
+                    self._last_header = marker
+                except Exception:
+                    # Metadata parsing errors should never stop telemetry updates
+                    pass
+                # Same moment is a good time to (re)learn the MAC for IP recovery
+                await self._async_learn_mac()
 
-            except Exception:
-                # Metadata parsing errors should never stop telemetry updates
-                pass
+            # --- Persist the working endpoint whenever it was (re)probed ---
+            self._persist_base_url()
 
             # --- Fail-safe total AC power calculation (PAC_TOTAL) ---
             pac_values = []
@@ -152,11 +289,36 @@ class SolutronicDataUpdateCoordinator(DataUpdateCoordinator):
                 # If ET missing, just report stored total
                 data["LIFETIME_DERIVED"] = round(self._lt_total, 3)
 
+            # --- Power-integrated lifetime energy (trapezoidal, reconciled to ET/EG) ---
+            data[KEY_LIFETIME_INTEGRATED] = self._integrate_power(data)
+
+            # --- Streaming analytics (O(1) per poll, no history queries) ---
+            data = self._with_analytics(data)
+
+            # --- Hourly long-term statistics (written to the recorder once per hour) ---
+            if self.long_term is not None:
+                self.long_term.add_sample(time.time(), data)
+
+            # --- Windowed aggregates from the high-rate sampler ---
+            if self.sampler is not None:
+                data = self._with_aggregates(data)
+
             # Store latest valid dataset for fallback use
             self._last_data = data
+            self._last_fingerprint = page.fingerprint
+            self._schedule_snapshot_save()
+            self._adapt_interval(data.get("PAC_TOTAL"))
+            self.metrics.observe("postprocess", (time.perf_counter() - postprocess_started) * 1000)
             return data
 
+        except CircuitOpenError as err:
+            # Inverter is known to be down: no network or ARP lookups, just the fallback
+            _LOGGER.debug("Solutronic (%s): %s", self.ip_address, err)
+            return self._fallback_data()
+
         except Exception as err:
+            self.metrics.increment("failures")
+
             # Log failure (not as error to avoid log spam)
             _LOGGER.warning(
                 "Failed to fetch data from Solutronic inverter (%s): %s",
@@ -166,7 +328,7 @@ class SolutronicDataUpdateCoordinator(DataUpdateCoordinator):
 
             # ---- Docker Bridge Mode Detection (no ARP visibility) ----
             try:
-                mac = await async_get_mac(self.ip_address)
+                mac = await async_get_mac(self.ip_address, self.hass)
                 if mac is None and not self._bridge_warning_logged:
                     _LOGGER.warning(
                         "Auto-reconnect disabled: Home Assistant appears to be running in Docker bridge mode "
@@ -178,35 +340,378 @@ class SolutronicDataUpdateCoordinator(DataUpdateCoordinator):
             except Exception:
                 pass
 
-            # ---- Controlled fallback data behavior ----
+            # ---- Breaker just opened: the inverter may have moved (DHCP) ----
+            if breaker_for(self.ip_address).state == CircuitBreaker.OPEN:
+                self._start_recovery()
+
+            return self._fallback_data()
 
-            last = self._last_data or {}
+    def _fallback_data(self):
+        """Return stable offline data: zeroed live readings, retained energy counters."""
+        fallback_started = time.perf_counter()
 
-            # Keys that should retain last known values (energy data)
-            retain_keys = ["ET", "EG", "LIFETIME_DERIVED"]
+        # ---- Controlled fallback data behavior ----
 
-            # Keys that should be zero when inverter is offline
-            zero_keys = [
-                "PAC", "PAC_TOTAL",
-                "PACL1", "PACL2", "PACL3",
-                "UDC1", "UDC2", "UDC3",
-                "IDC1", "IDC2", "IDC3",
-                "MAXP", "ETA",
-                "UACL1", "UACL2", "UACL3",
-            ]
+        last = self._last_data or {}
 
-            fallback = {}
+        # Keys that should retain last known values (energy data)
+        retain_keys = ["ET", "EG", "LIFETIME_DERIVED", KEY_LIFETIME_INTEGRATED]
 
-            # Set zero-values for momentary readings
-            for key in zero_keys:
-                fallback[key] = 0
+        # Keys that should be zero when inverter is offline
+        zero_keys = [
+            "PAC", "PAC_TOTAL",
+            "PACL1", "PACL2", "PACL3",
+            "UDC1", "UDC2", "UDC3",
+            "IDC1", "IDC2", "IDC3",
+            "MAXP", "ETA",
+            "UACL1", "UACL2", "UACL3",
+            "PDC1", "PDC2", "PDC3",
+        ]
 
-            # Restore ET + EG + Derived total if known
-            for key in retain_keys:
-                fallback[key] = last.get(key, 0)
+        fallback = {}
 
+        # Set zero-values for momentary readings
+        for key in zero_keys:
+            fallback[key] = 0
+
+        # Restore ET + EG + Derived total if known
+        for key in retain_keys:
+            fallback[key] = last.get(key, 0)
+
+        if fallback != self._last_data:
             self._last_data = fallback
-            return fallback
+            self._schedule_snapshot_save()
+        self._last_fingerprint = None
+        self._adapt_interval(None)
+        self.metrics.observe("fallback", (time.perf_counter() - fallback_started) * 1000)
+        return fallback
+
+    async def async_request_page(self, previous_fingerprint=None):
+        """Fetch one page under the hub's concurrency cap and shared session."""
+        # Fail fast, without queueing behind other inverters, while the breaker is open
+        raise_if_circuit_open(self.ip_address)
+        async with self.hub.semaphore if self.hub else nullcontext():
+            page = await async_get_inverter_data(
+                self.ip_address,
+                self.hass,
+                self.hub.session if self.hub else None,
+                previous_fingerprint=previous_fingerprint,
+                keys=TABLE_KEYS,
+                max_age=self.cache_ttl,
+            )
+        if self.page_log is not None:
+            self.page_log.record(time.time(), page.fingerprint, page.body, page.encoding)
+        return page
+
+    async def _async_fetch(self):
+        """Return the page for this update, reusing a fresh sample when sampling."""
+        if self.sampler is not None and self.sampler.is_fresh():
+            page = self.sampler.last_page
+            if page.fingerprint == self._last_fingerprint:
+                return InverterPage(None, None, page.fingerprint)
+            # Copy: post-processing adds derived keys to the dict
+            return InverterPage(dict(page.data), page.header, page.fingerprint)
+
+        return await self.async_request_page(self._last_fingerprint)
+
+    def _integrate_power(self, data):
+        """Feed new PAC_TOTAL samples to the integrator and return the rounded total.
+
+        With the sampler enabled, all samples taken since the last integration are
+        integrated in one batch from the ring buffer; otherwise the poll itself is
+        the sample.
+        """
+        pac = data.get("PAC_TOTAL")
+        if self.sampler is not None:
+            since = self.integrator.last_time
+            times, powers = self.sampler.buffers["PAC_TOTAL"].window(since if since is not None else 0)
+            for times_segment, powers_segment in zip(times, powers):
+                if since is not None and times_segment[0] == since:
+                    # Skip the sample that closed the previous batch
+                    times_segment, powers_segment = times_segment[1:], powers_segment[1:]
+                self.integrator.add_samples(times_segment, powers_segment)
+        elif isinstance(pac, (int, float)):
+            self.integrator.add_samples([time.monotonic()], [pac])
+
+        self.integrator.reconcile(data.get("ET"), data.get("EG"), pac)
+        if self.integrator.total is None:
+            return None
+        return round(self.integrator.total, 3)
+
+    def _long_term_statistics(self, state=None):
+        """Create the long-term statistics writer (imported only when enabled)."""
+        from .longterm import LongTermStatistics
+
+        return LongTermStatistics(self.hass, self.entry.entry_id.lower(), self.entry.title, state)
+
+    def _with_analytics(self, data):
+        """Return data with per-string power, phase imbalance and rolling PAC statistics."""
+        values, attributes = self.analytics.update(data, time.time())
+        return {**data, **values, KEY_STATISTICS: attributes}
+
+    def _with_aggregates(self, data):
+        """Return data with sampler aggregates for the window since the last publish."""
+        now = time.monotonic()
+        aggregates = self.sampler.aggregates(self._last_publish)
+        self._last_publish = now
+        return {**data, KEY_AGGREGATES: aggregates}
+
+    async def async_restore(self):
+        """Restore the persisted snapshot so entities have values before the first poll."""
+        if self._store is None:
+            return
+
+        snapshot = await self._store.async_load() or {}
+
+        # Reuse the persisted endpoint so startup can skip probing entirely
+        if snapshot.get("base_url"):
+            seed_base_url(self.ip_address, *snapshot["base_url"])
+        self._base_url = list(get_cached_base_url(self.ip_address) or ()) or None
+
+        if not snapshot:
+            return
+
+        self._last_data = snapshot.get("data")
+        self._lt_prev_et = snapshot.get("lt_prev_et")
+        self._lt_total = snapshot.get("lt_total")
+        self.integrator = PowerIntegrator(snapshot.get("integrator"))
+        self.analytics = StreamingAnalytics(snapshot.get("analytics"))
+        if self.long_term is not None:
+            self.long_term = self._long_term_statistics(snapshot.get("long_term"))
+        reported = snapshot.get("reported_keys")
+        self.reported_keys = frozenset(reported) if reported is not None else None
+        self.reported_keys_confirmed = snapshot.get("reported_keys_confirmed", False)
+        self.mac = snapshot.get("mac") or self.mac
+
+        # Set directly: listeners are attached later and read it on add
+        self.data = self._last_data
+
+    def _schedule_snapshot_save(self):
+        """Persist the current snapshot at most SNAPSHOT_SAVE_DELAY from now.
+
+        async_delay_save re-arms its timer on every call, and polls come more
+        often than the delay, so it is only called when no save is pending;
+        the snapshot itself is taken when the write happens.
+        """
+        if self._store is None:
+            return
+        now = time.monotonic()
+        if now >= self._snapshot_save_due:
+            self._snapshot_save_due = now + SNAPSHOT_SAVE_DELAY
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot(self):
+        """Return the state worth keeping across restarts."""
+        data = self._last_data
+        if data is not None and KEY_AGGREGATES in data:
+            data = {key: value for key, value in data.items() if key != KEY_AGGREGATES}
+        return {
+            "data": data,
+            "lt_prev_et": self._lt_prev_et,
+            "lt_total": self._lt_total,
+            "integrator": self.integrator.as_dict(),
+            "analytics": self.analytics.as_dict(),
+            "long_term": self.long_term.as_dict() if self.long_term is not None else None,
+            "reported_keys": sorted(self.reported_keys) if self.reported_keys is not None else None,
+            "reported_keys_confirmed": self.reported_keys_confirmed,
+            "base_url": self._base_url,
+            "mac": self.mac,
+        }
+
+    def _adapt_interval(self, pac):
+        """Pick the next poll interval from the current state.
+
+        Fast while PAC moves quickly, backing off towards max_interval while it is
+        flat, and a slow wake-up probe while the sun is down and nothing is produced.
+        """
+        prev, self._prev_pac = self._prev_pac, pac
+        current = self.update_interval.total_seconds()
+
+        if not pac:
+            # Offline or dark: sleep through the night, otherwise back off
+            try:
+                sun_up = is_up(self.hass)
+            except Exception:
+                sun_up = True
+            interval = self.max_interval if sun_up else max(self.max_interval, NIGHT_INTERVAL)
+        elif prev is None or abs(pac - prev) > PAC_CHANGE_THRESHOLD * max(prev, PAC_CHANGE_FLOOR):
+            interval = self.min_interval
+        else:
+            interval = min(current * 2, self.max_interval)
+
+        interval = max(interval, self.min_interval)
+        if interval != current:
+            _LOGGER.debug("Solutronic (%s): poll interval %ss -> %ss", self.ip_address, current, interval)
+            self.update_interval = timedelta(seconds=interval)
+
+    def _schedule_refresh(self):
+        """Schedule the next poll on a fixed grid of the interval.
+
+        Anchoring polls to `phase * interval` keeps inverters under the hub
+        spread evenly instead of all firing at the same instants. With
+        align_to_clock the grid is the wall clock's own (every 5 s lands on
+        :00, :05, ...), which lines up samples across inverters and restarts.
+        Either way a poll that overran its slot skips the ticks it missed.
+        """
+        if self.update_interval is None:
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+
+        interval = self.update_interval.total_seconds()
+        now = time.time()
+        due = next_tick(now, interval, 0.0 if self.align_to_clock else self.phase * interval)
+
+        if self._scheduled_at is not None and interval == self._scheduled_interval:
+            missed = round((due - self._scheduled_at) / interval) - 1
+            if missed > 0:
+                self.metrics.increment("skipped_ticks", missed)
+        self._scheduled_at, self._scheduled_interval = due, interval
+
+        # The timer runs on loop time; convert the wall-clock deadline
+        self._unsub_refresh = event.async_call_at(
+            self.hass, self._handle_refresh_interval, self.hass.loop.time() + due - now
+        )
+
+    async def _handle_refresh_interval(self, _now=None):
+        """Record how far the scheduled poll started from its tick, then run it."""
+        if self._scheduled_at is not None:
+            self.metrics.observe("tick_jitter", (time.time() - self._scheduled_at) * 1000)
+        await super()._handle_refresh_interval(_now)
+
+    def _apply_metadata(self, header):
+        """Apply parsed device metadata and persist it in the config entry."""
+        metadata = parse_device_metadata(header)
+
+        self.device_manufacturer = metadata.get("manufacturer", self.device_manufacturer)
+        self.device_model = metadata.get("model", self.device_model)
+        self.device_firmware = metadata.get("firmware", self.device_firmware)
+
+        # Persist metadata so it survives inverter offline periods and HA restarts
+        if self.entry is not None:
+            new_data = dict(self.entry.data)
+            new_data["manufacturer"] = self.device_manufacturer
+            new_data["model"] = self.device_model
+            new_data["firmware"] = self.device_firmware
+            new_data["serial"] = getattr(self, "device_serial", None)
+
+            if new_data != self.entry.data:
+                self.hass.config_entries.async_update_entry(self.entry, data=new_data)
+
+    def _persist_base_url(self):
+        """Keep the cached base URL and its expiry in the snapshot."""
+        cached = get_cached_base_url(self.ip_address)
+        if cached is not None and list(cached) != self._base_url:
+            self._base_url = list(cached)
+            self._schedule_snapshot_save()
+
+    # ---- MAC-anchored IP recovery ----
+
+    async def _async_learn_mac(self):
+        """Remember the inverter's MAC so it can be found again after a DHCP move."""
+        if self.entry is None:
+            return
+        try:
+            mac = await async_get_mac(self.ip_address, self.hass)
+        except Exception:
+            return
+        if mac is not None and mac != self.mac:
+            self.mac = mac
+            self._schedule_snapshot_save()
+
+    def _start_recovery(self):
+        """Look for the inverter under a new IP in the background (one search at a time)."""
+        if self.entry is None or not self.mac:
+            return
+        if self._recovery_task is not None and not self._recovery_task.done():
+            return
+        self._recovery_task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_recover(self.mac),
+            f"{DOMAIN} ip recovery {self.entry.entry_id}",
+        )
+
+    async def _async_recover(self, mac):
+        """Find the inverter by MAC: neighbour table first, then a targeted scan."""
+        from .neighbour import async_get_neighbour_table, invalidate_neighbour_table
+
+        # The cached table is what led to the failing IP; read the kernel's again
+        invalidate_neighbour_table()
+        table = await async_get_neighbour_table(self.hass)
+        if not table.available:
+            return  # No ARP visibility (Docker bridge mode); nothing to match against
+
+        new_ip = table.by_mac.get(mac)
+        if new_ip == self.ip_address:
+            return  # Still resolves to the known IP; it is just not answering
+
+        if new_ip is None:
+            if time.monotonic() < self._next_recovery_scan:
+                return
+            self._next_recovery_scan = time.monotonic() + RECOVERY_SCAN_INTERVAL
+            # The scan orders candidates by the neighbour table; do not let it use a stale one
+            invalidate_neighbour_table()
+            new_ip = await self._async_scan_for_mac(mac)
+            if new_ip is None:
+                return
+
+        # Make sure it really serves the inverter page (this also caches its endpoint)
+        try:
+            await async_get_sensor_data(new_ip, self.hass, self.hub.session if self.hub else None)
+        except Exception as err:
+            _LOGGER.debug("Solutronic: %s has MAC %s but does not answer: %s", new_ip, mac, err)
+            # Likely a stale ARP entry; the next lookup reads the kernel table again
+            invalidate_neighbour_table()
+            return
+
+        self._move_to(new_ip)
+
+    async def _async_scan_for_mac(self, mac):
+        """Scan the block around the last known IP and return the host with this MAC."""
+        import ipaddress
+
+        from .neighbour import async_get_neighbour_table
+
+        # Discovery (and ifaddr) is only needed here; import it off the event loop
+        discovery = await self.hass.async_add_executor_job(
+            importlib.import_module, f"{__package__}.discovery"
+        )
+
+        try:
+            network = ipaddress.ip_network(f"{self.ip_address}/{RECOVERY_SCAN_PREFIX}", strict=False)
+        except ValueError:
+            return None  # Configured with a hostname; nothing sensible to scan
+
+        # aclosing: returning early must still stop the scan's workers and session
+        async with aclosing(discovery.async_scan(networks=[network])) as found:
+            async for ip in found:
+                if ip == self.ip_address:
+                    continue
+                # The scan just talked to it, so its MAC is now in the neighbour table
+                table = await async_get_neighbour_table(self.hass, max_age=0)
+                if table.by_ip.get(ip) == mac:
+                    return ip
+        return None
+
+    def _move_to(self, new_ip):
+        """Switch the live coordinator to the inverter's new IP and persist it.
+
+        Updated in place rather than by reloading the entry; the entry's update
+        listener ignores data-only changes.
+        """
+        old_ip, self.ip_address = self.ip_address, new_ip
+        forget_host(old_ip)
+        self.metrics = metrics_for(new_ip)
+        self._last_fingerprint = None
+
+        _LOGGER.warning("Solutronic inverter moved from %s to %s (found by MAC)", old_ip, new_ip)
+
+        # The endpoint was cached by the check in _async_recover
+        self._persist_base_url()
+        if self.entry is not None:
+            self.hass.config_entries.async_update_entry(self.entry, data={**self.entry.data, CONF_IP_ADDRESS: new_ip})
 
     async def async_validate_connection(self):
         """Used by config flow to verify connectivity before setup."""
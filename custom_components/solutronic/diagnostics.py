@@ -0,0 +1,46 @@
+"""Diagnostics support for the Solutronic integration."""
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN
+from .solutronic_api import breaker_for
+
+# "SN" is the serial number as it appears in the inverter data
+TO_REDACT = {"ip_address", "base_url", "serial", "mac", "SN"}
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return poll latency histograms, counters and current state for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    counters = coordinator.metrics.counters
+    created = counters.get("connections_created", 0)
+    reused = counters.get("connections_reused", 0)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "suppressed_writes": coordinator.suppressed_writes,
+            "manufacturer": coordinator.device_manufacturer,
+            "model": coordinator.device_model,
+            "firmware": coordinator.device_firmware,
+            "circuit_breaker": breaker_for(coordinator.ip_address).as_dict(),
+            "reported_keys": sorted(coordinator.reported_keys or ()),
+            "reported_keys_confirmed": coordinator.reported_keys_confirmed,
+            "page_log": coordinator.page_log.as_dict() if coordinator.page_log is not None else None,
+            "long_term_statistics": (
+                coordinator.long_term.diagnostics() if coordinator.long_term is not None else None
+            ),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "connections": {
+            "created": created,
+            "reused": reused,
+            "reuse_rate": round(reused / (created + reused), 3) if created + reused else None,
+        },
+        "data": async_redact_data(coordinator.data or {}, TO_REDACT),
+    }
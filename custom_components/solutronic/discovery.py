@@ -2,40 +2,156 @@ import aiohttp
 import asyncio
 import ifaddr
 import ipaddress
+import logging
 
-async def discover_solutronic():
+from .neighbour import async_get_neighbour_table
+
+_LOGGER = logging.getLogger(__name__)
+
+SCAN_PORT = 8888
+SCAN_PATH = "/solutronic/"
+
+# Number of hosts probed at the same time (also caps open sockets)
+DEFAULT_CONCURRENCY = 64
+# Maximum number of new connection attempts per second
+DEFAULT_RATE_LIMIT = 250
+
+CONNECT_TIMEOUT = 0.5  # TCP pre-check, seconds
+HTTP_TIMEOUT = 2  # GET of the inverter page, seconds
+
+# Subnets larger than this are narrowed to the block around our own address,
+# so a /16 on one adapter cannot turn into a 65k host sweep
+MIN_SCAN_PREFIX = 22
+
+
+async def discover_solutronic(**kwargs):
     """Scan local network for Solutronic inverters."""
-    network = _get_local_subnet()
-    if not network:
-        return []
+    return [ip async for ip in async_scan(**kwargs)]
+
+
+async def async_scan(
+    concurrency=DEFAULT_CONCURRENCY,
+    rate_limit=DEFAULT_RATE_LIMIT,
+    port=SCAN_PORT,
+    networks=None,
+):
+    """Yield IPs of responding inverters as soon as they are found.
+
+    Hosts from the ARP/neighbour table are tried first, then every IPv4 subnet
+    of every adapter (loopback and link-local skipped). A fixed pool of
+    `concurrency` workers pulls hosts from a lazy iterator, so memory and open
+    sockets stay bounded regardless of subnet size.
+    """
+    loop = asyncio.get_running_loop()
+    if networks is None:
+        networks = await loop.run_in_executor(None, _get_local_subnets)
+    neighbours = list((await async_get_neighbour_table()).by_ip)
+
+    if not networks and not neighbours:
+        return
+
+    candidates = _iter_candidates(neighbours, networks)
+    limiter = _RateLimiter(rate_limit)
+    results = asyncio.Queue()
+    done = object()
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            _check_ip(session, str(host))
-            for host in network.hosts()
-        ]
-        results = await asyncio.gather(*tasks)
-        return [ip for ip in results if ip]
+    connector = aiohttp.TCPConnector(limit=concurrency, force_close=True)
+    async with aiohttp.ClientSession(connector=connector) as session:
 
+        async def worker():
+            try:
+                for ip in candidates:
+                    await limiter.acquire()
+                    if await _check_ip(session, ip, port):
+                        results.put_nowait(ip)
+            finally:
+                results.put_nowait(done)
 
-async def _check_ip(session, ip):
-    url = f"http://{ip}:8888/solutronic/"
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # Stop scanning if the consumer leaves early
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _check_ip(session, ip, port=SCAN_PORT):
+    """Return True if ip runs the Solutronic web interface."""
+    # Cheap TCP connect first; most hosts in a subnet do not listen at all
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
     try:
-        async with session.get(url, timeout=1) as r:
-            if r.status == 200:
-                return ip
-    except:
-        return None
+        await writer.wait_closed()
+    except OSError:
+        pass  # Reset by the peer; the socket is closed either way
+
+    url = f"http://{ip}:{port}{SCAN_PATH}"
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)) as r:
+            return r.status == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return False
+
+
+def _iter_candidates(neighbours, networks):
+    """Yield neighbour IPs first, then the hosts of each network, without duplicates."""
+    seen = set()
+    for ip in neighbours:
+        if ip not in seen:
+            seen.add(ip)
+            yield ip
+    for network in networks:
+        for host in network.hosts():
+            ip = str(host)
+            if ip not in seen:
+                seen.add(ip)
+                yield ip
+
+
+class _RateLimiter:
+    """Space out acquisitions so at most `rate` happen per second."""
+
+    def __init__(self, rate):
+        self._interval = 1 / rate if rate else 0
+        self._next = 0.0
+
+    async def acquire(self):
+        if not self._interval:
+            # Still yield so a huge sweep cannot starve the event loop
+            await asyncio.sleep(0)
+            return
+        now = asyncio.get_running_loop().time()
+        wait = self._next - now
+        self._next = max(now, self._next) + self._interval
+        await asyncio.sleep(max(wait, 0))
 
 
-def _get_local_subnet():
-    """Auto-detect the subnet HA is running on."""
-    adapters = ifaddr.get_adapters()
-    for adapter in adapters:
+def _get_local_subnets():
+    """Return the IPv4 subnets of all usable adapters HA is running on."""
+    networks = []
+    for adapter in ifaddr.get_adapters():
         for ip in adapter.ips:
-            if isinstance(ip.ip, str) and "." in ip.ip:
-                try:
-                    return ipaddress.ip_network(f"{ip.ip}/{ip.network_prefix}", strict=False)
-                except:
-                    pass
-    return None
\ No newline at end of file
+            if not (isinstance(ip.ip, str) and "." in ip.ip):
+                continue
+            try:
+                address = ipaddress.ip_address(ip.ip)
+                if address.is_loopback or address.is_link_local:
+                    continue
+                prefix = max(ip.network_prefix, MIN_SCAN_PREFIX)
+                network = ipaddress.ip_network(f"{ip.ip}/{prefix}", strict=False)
+            except ValueError:
+                continue
+            if network not in networks:
+                networks.append(network)
+    return networks
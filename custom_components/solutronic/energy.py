@@ -0,0 +1,111 @@
+"""Energy counter integrated from AC power samples.
+
+A higher-resolution alternative to LIFETIME_DERIVED, which only advances in
+ET's coarse steps. PAC_TOTAL samples are integrated with the trapezoidal rule
+and reconciled against the inverter's own ET/EG counters so drift stays
+bounded: today's integral is clamped to ET + tolerance and catches up when it
+falls behind by more than the tolerance. The counter never decreases.
+"""
+
+from itertools import islice
+from operator import add, mul, sub
+
+# Samples further apart than this are not integrated across (outage, restart)
+MAX_GAP = 600  # seconds
+
+# Allowed disagreement with ET (today) before correcting, in kWh.
+# ET is reported with 0.1 kWh resolution, so stay above that.
+ET_TOLERANCE = 0.2
+# Allowed lag behind EG (lifetime, whole kWh) before jumping up to it, in kWh
+EG_TOLERANCE = 1.5
+
+_WS_PER_KWH = 3_600_000
+
+
+class PowerIntegrator:
+    """Trapezoidal W -> kWh integrator with ET/EG reconciliation."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.total = state.get("total")  # kWh, None until seeded from EG
+        self._today = state.get("today", 0.0)  # kWh added to total since ET last reset
+        self._prev_et = state.get("prev_et")
+
+        # Last integrated sample; not persisted, so restarts begin a new segment
+        self._last_time = None
+        self._last_power = None
+
+    @property
+    def last_time(self):
+        """Timestamp of the last integrated sample (None before the first one)."""
+        return self._last_time
+
+    def as_dict(self):
+        """Return the state worth persisting across restarts."""
+        return {"total": self.total, "today": self._today, "prev_et": self._prev_et}
+
+    def add_samples(self, times, powers):
+        """Integrate a batch of (monotonic time, W) samples newer than the last one.
+
+        times/powers are equal-length sequences (lists or memoryview slices).
+        """
+        if self._last_time is not None:
+            times = [self._last_time, *times]
+            powers = [self._last_power, *powers]
+        if len(times) < 2:
+            if times:
+                self._last_time, self._last_power = times[-1], powers[-1]
+            return
+
+        # Interval widths and summed end-point powers, computed with C-level map()
+        widths = list(map(sub, islice(times, 1, None), times))
+        heights = map(add, islice(powers, 1, None), powers)
+
+        if max(widths) <= MAX_GAP:
+            watt_seconds = sum(map(mul, widths, heights)) / 2
+        else:
+            # Rare: skip intervals spanning an outage, ET reconciliation covers them
+            watt_seconds = sum(
+                width * height for width, height in zip(widths, heights) if 0 < width <= MAX_GAP
+            ) / 2
+
+        self._last_time, self._last_power = times[-1], powers[-1]
+
+        kwh = max(watt_seconds, 0) / _WS_PER_KWH
+        if self._prev_et is not None:
+            # Never run further ahead of ET than its rounding allows
+            kwh = min(kwh, max(self._prev_et + ET_TOLERANCE - self._today, 0))
+        self._advance(kwh)
+
+    def reconcile(self, et, eg, pac):
+        """Bound drift against the inverter's own counters (kWh)."""
+        if self.total is None:
+            if not isinstance(eg, (int, float)):
+                return
+            # First run: start from the inverter's lifetime total, which
+            # already includes today's ET
+            self.total = float(eg)
+            if isinstance(et, (int, float)):
+                self._today = et
+
+        if isinstance(et, (int, float)):
+            if self._prev_et is not None and et < self._prev_et:
+                # ET reset overnight (new day)
+                self._today = 0.0
+            elif not pac:
+                # ET moved without production (e.g. false morning start):
+                # rebase only, never count it as energy
+                self._today = max(self._today, et)
+            elif et - self._today > ET_TOLERANCE:
+                # We missed production (gap, outage); catch up to ET
+                self._advance(et - self._today)
+            self._prev_et = et
+
+        if isinstance(eg, (int, float)) and eg - self.total > EG_TOLERANCE:
+            self.total = float(eg)
+
+    def _advance(self, kwh):
+        """Add kWh to today's share and the lifetime counter."""
+        self._today += kwh
+        if self.total is not None:
+            self.total += kwh
@@ -0,0 +1,167 @@
+"""Hub shared by all Solutronic inverters configured in this HA instance.
+
+The hub owns one tuned aiohttp session, caps how many inverters are polled at
+the same time and hands out phase offsets so the per-entry coordinators spread
+their requests evenly over the update interval instead of firing together.
+"""
+
+import asyncio
+import logging
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+
+from .const import DOMAIN, DATA_HUB
+from .solutronic_api import create_session, shutdown_parse_executor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of inverter requests in flight across the whole hub
+HUB_MAX_CONCURRENT = 4
+
+# Fleet totals computed from the per-inverter data (no extra requests)
+FLEET_KEYS = ("PAC_TOTAL", "ET")
+# Fleet sensors exist (and are available) only with at least this many inverters
+FLEET_MIN_INVERTERS = 2
+
+
+@callback
+def async_get_hub(hass):
+    """Return the hub, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_HUB)
+    if hub is None:
+        hub = domain_data[DATA_HUB] = SolutronicHub(hass)
+    return hub
+
+
+class SolutronicHub:
+    """Shared session, concurrency cap and staggered scheduling for all inverters."""
+
+    def __init__(self, hass):
+        self.hass = hass
+        self.semaphore = asyncio.Semaphore(HUB_MAX_CONCURRENT)
+        self.fleet_data = {}
+
+        self._session = None
+        self._unsub_close = None
+        self._coordinators = {}  # entry_id -> coordinator
+        self._unsub_coordinators = {}
+        self._listeners = []
+
+        # Fleet sensors live on one entry's platform; keep every entry's
+        # add-entities callback so ownership can move if that entry unloads
+        self._add_entities = {}
+        self._fleet_owner = None
+
+    @property
+    def session(self):
+        """Return the hub's keep-alive session, creating it lazily."""
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+            if self._unsub_close is None:
+                # Entries are not unloaded on shutdown; close the pool ourselves
+                self._unsub_close = self.hass.bus.async_listen_once(
+                    EVENT_HOMEASSISTANT_CLOSE, self._async_close_session
+                )
+        return self._session
+
+    async def _async_close_session(self, event=None):
+        """Close the session and its pooled keep-alive connections."""
+        if self._unsub_close is not None and event is None:
+            self._unsub_close()
+        self._unsub_close = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def coordinators(self):
+        """Return the registered coordinators."""
+        return list(self._coordinators.values())
+
+    @callback
+    def async_register(self, entry_id, coordinator):
+        """Add an inverter to the hub and rebalance phase offsets."""
+        self._coordinators[entry_id] = coordinator
+        self._unsub_coordinators[entry_id] = coordinator.async_add_listener(self._async_update_fleet)
+        self._rebalance()
+
+    async def async_unregister(self, entry_id):
+        """Remove an inverter; close the session when the last one is gone."""
+        self._coordinators.pop(entry_id, None)
+        self._add_entities.pop(entry_id, None)
+        unsub = self._unsub_coordinators.pop(entry_id, None)
+        if unsub is not None:
+            unsub()
+
+        if self._fleet_owner == entry_id:
+            self._fleet_owner = None
+        self._rebalance()
+        self._async_ensure_fleet_entities()
+        # Totals (and availability) change with the set of inverters
+        self._async_update_fleet()
+
+        if not self._coordinators:
+            await self._async_close_session()
+            shutdown_parse_executor()
+            self.hass.data.get(DOMAIN, {}).pop(DATA_HUB, None)
+
+    def _rebalance(self):
+        """Spread coordinators evenly over their update interval."""
+        count = len(self._coordinators)
+        for index, coordinator in enumerate(self._coordinators.values()):
+            coordinator.phase = index / count
+
+    # ---- Fleet totals ----
+
+    @callback
+    def async_setup_fleet(self, entry_id, async_add_entities):
+        """Remember an entry's add-entities callback for fleet sensors."""
+        self._add_entities[entry_id] = async_add_entities
+        self._async_ensure_fleet_entities()
+
+    @property
+    def fleet_active(self):
+        """Return True while enough inverters are registered for fleet totals."""
+        return len(self._coordinators) >= FLEET_MIN_INVERTERS
+
+    @callback
+    def _async_ensure_fleet_entities(self):
+        """Create fleet sensors once more than one inverter is configured."""
+        if self._fleet_owner is not None or not self.fleet_active:
+            return
+        if not self._add_entities:
+            return
+
+        # Imported here to avoid a circular import with the sensor platform
+        from .sensor import SolutronicFleetSensor
+
+        self._fleet_owner, async_add_entities = next(iter(self._add_entities.items()))
+        async_add_entities([SolutronicFleetSensor(self, key) for key in FLEET_KEYS])
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Listen for fleet total changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_update_fleet(self):
+        """Recompute fleet totals from the latest data of every inverter."""
+        totals = {}
+        for key in FLEET_KEYS:
+            values = [
+                c.data.get(key) for c in self._coordinators.values()
+                if c.data and isinstance(c.data.get(key), (int, float))
+            ]
+            totals[key] = round(sum(values), 3) if values else None
+        self.fleet_data = totals
+
+        for update_callback in list(self._listeners):
+            update_callback()
@@ -0,0 +1,239 @@
+"""Long-term statistics written in bulk through the recorder's external statistics API.
+
+Live samples are aggregated in memory into 5-minute buckets of PAC_TOTAL
+(mean/min/max); when an hour is over its buckets become one hourly power row,
+and an hourly energy row records a cumulative sum. Both are handed to the
+recorder in one call per hour instead of as a state write per poll.
+
+Outages (including the night) produce no samples and therefore no power rows
+rather than false zeros. When the inverter is back, the energy produced
+meanwhile is taken from the inverter's own counters (ET delta within the same
+day; across midnight the EG delta if it is more than EG's rounding, otherwise
+today's ET from midnight on) and spread evenly over the hours it can have been
+produced in, written as one bulk backfill. The normal night shutdown (PAC ~0
+at both ends) is not backfilled.
+
+The recorder only accepts hour-aligned rows from external sources, so the
+5-minute buckets feed the hourly rows and diagnostics; they are not written.
+"""
+
+import logging
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, KEY_LIFETIME_INTEGRATED
+from .energy import MAX_GAP
+
+_LOGGER = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 300
+HOUR_SECONDS = 3600
+# Samples further apart than this are an outage, backfilled from ET/EG
+OUTAGE_GAP = MAX_GAP  # seconds
+# Longest outage that is backfilled, and the most rows kept while the recorder is away
+BACKFILL_MAX_HOURS = 7 * 24
+# PAC at or below this at both ends of a gap shorter than a day is the night shutdown
+IDLE_POWER = 10  # W
+DAY_SECONDS = 86400
+# EG only counts whole kWh; smaller deltas are rounding, not production
+EG_RESOLUTION = 1.0  # kWh
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) else None
+
+
+class LongTermStatistics:
+    """Hourly power and energy statistics for one inverter."""
+
+    def __init__(self, hass, object_id, name, state=None):
+        state = state or {}
+        self.hass = hass
+        self.power_id = f"{DOMAIN}:{object_id}_power"
+        self.energy_id = f"{DOMAIN}:{object_id}_energy"
+        self.name = name
+
+        self._hour = state.get("hour")  # start of the hour being aggregated (epoch seconds)
+        self._buckets = {int(start): bucket for start, bucket in state.get("buckets", {}).items()}
+        self._last = state.get("last")  # [timestamp, lifetime total, ET, EG, PAC] of the last sample
+        self._sum = state.get("sum")  # cumulative kWh written as the energy statistic's sum
+
+        # Rows waiting for the recorder, written in bulk
+        self._pending_power = []
+        self._pending_energy = []
+        self.rows_written = 0
+        self.hours_backfilled = 0
+
+    def as_dict(self):
+        """Return the state worth persisting across restarts."""
+        return {
+            "hour": self._hour,
+            "buckets": {str(start): bucket for start, bucket in self._buckets.items()},
+            "last": self._last,
+            "sum": self._sum,
+        }
+
+    def diagnostics(self):
+        """Return counters and the current hour's 5-minute buckets."""
+        return {
+            "statistic_ids": [self.power_id, self.energy_id],
+            "rows_written": self.rows_written,
+            "hours_backfilled": self.hours_backfilled,
+            "pending_rows": len(self._pending_power) + len(self._pending_energy),
+            "buckets": {
+                dt_util.utc_from_timestamp(start).isoformat(): {
+                    "mean": round(total / count, 1), "min": low, "max": high, "samples": count,
+                }
+                for start, (count, total, low, high) in sorted(self._buckets.items())
+            },
+        }
+
+    @callback
+    def add_sample(self, timestamp, data):
+        """Aggregate one live poll (never the offline fallback)."""
+        total = _number(data.get(KEY_LIFETIME_INTEGRATED))
+        if total is None:
+            total = _number(data.get("LIFETIME_DERIVED"))
+        power = _number(data.get("PAC_TOTAL"))
+        sample = [timestamp, total, _number(data.get("ET")), _number(data.get("EG")), power]
+        hour = timestamp - timestamp % HOUR_SECONDS
+
+        outage = self._last is not None and timestamp - self._last[0] > OUTAGE_GAP
+        if self._hour is not None and hour > self._hour:
+            self._close_hour()
+            if outage:
+                self._backfill(self._last, sample, hour)
+        elif outage and self._sum is not None:
+            # Short outage within the hour: no rows to fill, just count the energy
+            self._sum += self._outage_energy(self._last, sample)[0]
+
+        # --- Energy: follow the lifetime counter between samples ---
+        if total is not None:
+            if self._sum is None:
+                self._sum = total
+            elif not outage and self._last is not None and self._last[1] is not None:
+                self._sum += max(total - self._last[1], 0.0)
+
+        # --- Power: 5-minute bucket of PAC_TOTAL ---
+        if power is not None:
+            start = int(timestamp - timestamp % BUCKET_SECONDS)
+            bucket = self._buckets.get(start)
+            if bucket is None:
+                self._buckets[start] = [1, power, power, power]
+            else:
+                bucket[0] += 1
+                bucket[1] += power
+                bucket[2] = min(bucket[2], power)
+                bucket[3] = max(bucket[3], power)
+
+        self._hour = hour
+        self._last = sample
+        self._async_write()
+
+    def _close_hour(self):
+        """Turn the finished hour's buckets into one power row and one energy row."""
+        start = dt_util.utc_from_timestamp(self._hour)
+        buckets = self._buckets.values()
+        if buckets:
+            count = sum(bucket[0] for bucket in buckets)
+            self._pending_power.append({
+                "start": start,
+                "mean": sum(bucket[1] for bucket in buckets) / count,
+                "min": min(bucket[2] for bucket in buckets),
+                "max": max(bucket[3] for bucket in buckets),
+            })
+        if self._sum is not None:
+            self._pending_energy.append({"start": start, "state": self._sum, "sum": self._sum})
+        self._buckets = {}
+
+    def _backfill(self, before, after, hour):
+        """Spread the energy produced during an outage over the hours it covered."""
+        if self._sum is None:
+            return
+        energy, since = self._outage_energy(before, after)
+        if self._is_night(before, after) or energy <= 0:
+            # Nothing was produced meanwhile (dark): no rows to write
+            self._sum += energy
+            return
+        ended = after[0]
+        first = self._hour + HOUR_SECONDS  # the hour after the last one with samples
+        hours = range(int(max(first, hour - BACKFILL_MAX_HOURS * HOUR_SECONDS)), int(hour), HOUR_SECONDS)
+        for start in hours:
+            # Cumulative sum at the end of this hour, assuming even production from since on
+            fraction = min(max((start + HOUR_SECONDS - since) / (ended - since), 0.0), 1.0)
+            value = self._sum + energy * fraction
+            self._pending_energy.append(
+                {"start": dt_util.utc_from_timestamp(start), "state": value, "sum": value}
+            )
+        self.hours_backfilled += len(hours)
+        self._sum += energy
+        _LOGGER.debug(
+            "Solutronic statistics: backfilled %.3f kWh over %d hours (%s)", energy, len(hours), self.energy_id
+        )
+
+    @staticmethod
+    def _is_night(before, after):
+        """Return True if a gap is the inverter's normal night shutdown."""
+        # Samples persisted by older versions have no PAC
+        powers = [sample[4] if len(sample) > 4 else None for sample in (before, after)]
+        return (
+            after[0] - before[0] < DAY_SECONDS
+            and all(power is not None and power <= IDLE_POWER for power in powers)
+        )
+
+    @staticmethod
+    def _outage_energy(before, after):
+        """Return (kWh produced between two samples, earliest time it can have been produced).
+
+        Taken from the inverter's own counters.
+        """
+        started, total_before, et_before, eg_before = before[:4]
+        ended, total_after, et_after, eg_after = after[:4]
+        midnight = dt_util.start_of_local_day(dt_util.as_local(dt_util.utc_from_timestamp(ended))).timestamp()
+        if started >= midnight and et_before is not None and et_after is not None and et_after >= et_before:
+            return et_after - et_before, started
+        if eg_before is not None and eg_after is not None and eg_after - eg_before > EG_RESOLUTION:
+            # Today's ET was certainly produced, even if EG rounded down
+            return max(eg_after - eg_before, et_after or 0.0), started
+        if et_after is not None:
+            # EG moved by no more than its rounding: count what today's ET shows
+            return et_after, max(started, midnight)
+        if total_before is not None and total_after is not None:
+            return max(total_after - total_before, 0.0), started
+        return 0.0, started
+
+    @callback
+    def _async_write(self):
+        """Hand pending rows to the recorder in one call per statistic."""
+        if not self._pending_power and not self._pending_energy:
+            return
+        if "recorder" not in self.hass.config.components:
+            # Keep the newest rows until the recorder is up
+            del self._pending_power[:-BACKFILL_MAX_HOURS]
+            del self._pending_energy[:-BACKFILL_MAX_HOURS]
+            return
+
+        # Imported here: the recorder is heavy and only needed once an hour
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        if self._pending_power:
+            async_add_external_statistics(self.hass, {
+                "has_mean": True,
+                "has_sum": False,
+                "name": f"{self.name} AC effekt",
+                "source": DOMAIN,
+                "statistic_id": self.power_id,
+                "unit_of_measurement": "W",
+            }, self._pending_power)
+        if self._pending_energy:
+            async_add_external_statistics(self.hass, {
+                "has_mean": False,
+                "has_sum": True,
+                "name": f"{self.name} produktion",
+                "source": DOMAIN,
+                "statistic_id": self.energy_id,
+                "unit_of_measurement": "kWh",
+            }, self._pending_energy)
+        self.rows_written += len(self._pending_power) + len(self._pending_energy)
+        self._pending_power, self._pending_energy = [], []
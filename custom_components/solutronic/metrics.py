@@ -0,0 +1,111 @@
+"""Lightweight per-inverter latency and failure metrics.
+
+Each stage of a poll (probe, HTTP round trip, decode, parse, post-processing,
+fallback) is timed with perf_counter and recorded into a fixed-bucket
+histogram plus a short rolling window for percentiles. Recording is a bisect
+and two appends, cheap enough to stay enabled in production.
+"""
+
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Durations kept per stage for rolling percentiles
+ROLLING_WINDOW = 256
+
+_METRICS = {}  # host -> PollMetrics
+
+
+def metrics_for(host):
+    """Return the metrics object for a host, creating it on first use."""
+    metrics = _METRICS.get(host)
+    if metrics is None:
+        metrics = _METRICS[host] = PollMetrics()
+    return metrics
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a rolling window of recent durations."""
+
+    __slots__ = ("counts", "recent", "total_ms", "count", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.recent = deque(maxlen=ROLLING_WINDOW)
+        self.total_ms = 0.0
+        self.count = 0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        """Record one duration in milliseconds."""
+        self.counts[bisect_left(BUCKETS_MS, ms)] += 1
+        self.recent.append(ms)
+        self.total_ms += ms
+        self.count += 1
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction):
+        """Return the given percentile (0..1) over the rolling window, in ms."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 2)
+
+    @property
+    def last(self):
+        """Most recent duration in ms (None before the first one)."""
+        return round(self.recent[-1], 2) if self.recent else None
+
+    def as_dict(self):
+        """Return a JSON-friendly summary."""
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "last_ms": self.last,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PollMetrics:
+    """Per-stage latency histograms and event counters for one inverter."""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    def observe(self, stage, ms):
+        """Record a duration for a stage."""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = LatencyHistogram()
+        histogram.observe(ms)
+
+    @contextmanager
+    def time(self, stage):
+        """Time the enclosed block into a stage (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, (time.perf_counter() - started) * 1000)
+
+    def increment(self, counter, amount=1):
+        """Bump an event counter (failures, retries, reprobes, ...)."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def as_dict(self):
+        """Return a JSON-friendly summary of all stages and counters."""
+        return {
+            "stages": {name: histogram.as_dict() for name, histogram in self.stages.items()},
+            "counters": dict(self.counters),
+        }
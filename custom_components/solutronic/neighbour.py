@@ -0,0 +1,78 @@
+"""In-process reader for the kernel neighbour (ARP) table.
+
+Replaces spawning `arp -n` for every lookup. The table is read from
+/proc/net/arp and cached for a few seconds, shared by all config entries.
+"""
+
+import asyncio
+import time
+from typing import NamedTuple
+
+ARP_TABLE_PATH = "/proc/net/arp"
+
+# How long a parsed table is reused before reading the kernel table again (seconds)
+NEIGHBOUR_TTL = 10
+
+# Flags value the kernel uses for incomplete entries (no MAC resolved yet)
+_INCOMPLETE_FLAGS = "0x0"
+_EMPTY_MAC = "00:00:00:00:00:00"
+
+
+class NeighbourTable(NamedTuple):
+    """Snapshot of the neighbour table with lookups in both directions."""
+
+    by_ip: dict
+    by_mac: dict
+    # False when the table could not be read at all (e.g. no /proc access)
+    available: bool
+
+
+_cache = None  # (monotonic time read, NeighbourTable)
+_lock = asyncio.Lock()
+
+
+def read_neighbour_table(path=ARP_TABLE_PATH) -> NeighbourTable:
+    """Parse the kernel ARP table (blocking; run in an executor)."""
+    try:
+        with open(path, encoding="ascii") as f:
+            lines = f.readlines()[1:]
+    except OSError:
+        return NeighbourTable({}, {}, False)
+
+    by_ip = {}
+    by_mac = {}
+    for line in lines:
+        # IP address, HW type, Flags, HW address, Mask, Device
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        ip, flags, mac = fields[0], fields[2], fields[3].lower()
+        if flags == _INCOMPLETE_FLAGS or mac == _EMPTY_MAC:
+            continue
+        by_ip[ip] = mac
+        by_mac[mac] = ip
+
+    return NeighbourTable(by_ip, by_mac, True)
+
+
+async def async_get_neighbour_table(hass=None, max_age=NEIGHBOUR_TTL) -> NeighbourTable:
+    """Return the cached neighbour table, refreshing it when older than max_age."""
+    global _cache
+
+    async with _lock:
+        if _cache is not None and time.monotonic() - _cache[0] < max_age:
+            return _cache[1]
+
+        if hass is not None:
+            table = await hass.async_add_executor_job(read_neighbour_table)
+        else:
+            table = await asyncio.get_running_loop().run_in_executor(None, read_neighbour_table)
+
+        _cache = (time.monotonic(), table)
+        return table
+
+
+def invalidate_neighbour_table() -> None:
+    """Drop the cached table so the next lookup reads the kernel table again."""
+    global _cache
+    _cache = None
@@ -0,0 +1,246 @@
+"""Compact record-and-replay log of raw inverter pages.
+
+Every fetched page is appended with its timestamp to a segment file under
+<config>/solutronic_pages/. Records are batched in memory and written from the
+executor as one gzip member per flush, so the event loop never touches the
+disk and a crash loses at most one batch (a truncated last member is skipped
+when reading). A page already stored in the current segment is written as a
+short reference to its hash. Segments rotate at SEGMENT_MAX_BYTES and the
+oldest ones are deleted once an entry's segments exceed LOG_MAX_BYTES.
+
+Record layout (uncompressed, big-endian):
+
+    b"P" timestamp:f64 fingerprint:16s encoding_len:u8 encoding body_len:u32 body
+    b"R" timestamp:f64 fingerprint:16s
+"""
+
+import gzip
+import logging
+import os
+import struct
+import time
+import zlib
+from datetime import timedelta
+from typing import NamedTuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024  # compressed bytes before a new segment is started
+LOG_MAX_BYTES = 64 * 1024 * 1024  # compressed bytes kept per config entry
+FLUSH_INTERVAL = 60  # seconds between batch writes
+FLUSH_BYTES = 256 * 1024  # distinct page bytes that trigger an early write
+MAX_PENDING_BYTES = 4 * 1024 * 1024  # records are dropped beyond this while writes lag
+
+SEGMENT_SUFFIX = ".pages.gz"
+
+_PAGE = struct.Struct(">cd16sB")
+_BODY_LENGTH = struct.Struct(">I")
+_REFERENCE = struct.Struct(">cd16s")
+
+
+class PageRecord(NamedTuple):
+    """One recorded poll."""
+
+    timestamp: float  # wall-clock seconds
+    fingerprint: bytes
+    body: bytes
+    encoding: str
+
+
+class PageLog:
+    """Batched, size-capped recorder of raw pages for one config entry."""
+
+    def __init__(self, hass, directory, prefix):
+        self.hass = hass
+        self.directory = directory
+        self.prefix = prefix
+
+        self.recorded = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+        self._pending = []  # (timestamp, fingerprint, body, encoding)
+        self._pending_bytes = 0
+        self._last_fingerprint = None
+        self._flush_task = None
+        self._unsub_timer = None
+        self._unsub_final_write = None
+
+        # Current segment; only touched from the executor, one flush at a time
+        self._segment = None
+        self._segment_size = 0
+        self._stored = set()  # fingerprints with a full page in the current segment
+
+    @callback
+    def async_start(self):
+        """Start the periodic batch writer."""
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_flush_timer, timedelta(seconds=FLUSH_INTERVAL)
+        )
+        # Entries are not unloaded on shutdown; write the last batch with HA's own stores
+        self._unsub_final_write = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+        )
+
+    async def _async_final_write(self, event):
+        self._unsub_final_write = None
+        await self.async_close()
+
+    async def async_close(self):
+        """Stop the timer and write what is still pending."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._unsub_final_write is not None:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+        self._schedule_flush()
+        if self._flush_task is not None:
+            await self._flush_task
+
+    @callback
+    def record(self, timestamp, fingerprint, body, encoding):
+        """Queue one page; never blocks on I/O."""
+        if body is None:
+            return
+        if self._pending_bytes >= MAX_PENDING_BYTES:
+            self.dropped += 1
+            return
+        self._pending.append((timestamp, fingerprint, body, encoding))
+        self.recorded += 1
+        # Repeats of the previous page share its bytes (and are stored as references)
+        if fingerprint != self._last_fingerprint:
+            self._pending_bytes += len(body)
+            self._last_fingerprint = fingerprint
+        if self._pending_bytes >= FLUSH_BYTES:
+            self._schedule_flush()
+
+    @callback
+    def _async_flush_timer(self, now=None):
+        self._schedule_flush()
+
+    @callback
+    def _schedule_flush(self):
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = self.hass.async_create_background_task(
+                self._async_flush(), f"solutronic page log {self.prefix}"
+            )
+
+    async def _async_flush(self):
+        while self._pending:
+            batch = self._pending
+            self._pending, self._pending_bytes, self._last_fingerprint = [], 0, None
+            try:
+                await self.hass.async_add_executor_job(self._write_batch, batch)
+            except OSError as err:
+                self.dropped += len(batch)
+                _LOGGER.warning("Solutronic page log: could not write %s: %s", self.directory, err)
+                return
+
+    # ---- Executor side ----
+
+    def _write_batch(self, batch):
+        """Encode a batch and append it to the current segment as one gzip member."""
+        if self._segment is None or self._segment_size >= SEGMENT_MAX_BYTES:
+            self._start_segment()
+
+        buffer = bytearray()
+        for timestamp, fingerprint, body, encoding in batch:
+            if fingerprint in self._stored:
+                buffer += _REFERENCE.pack(b"R", timestamp, fingerprint)
+                self.deduplicated += 1
+                continue
+            encoded = encoding.encode("ascii")
+            buffer += _PAGE.pack(b"P", timestamp, fingerprint, len(encoded))
+            buffer += encoded
+            buffer += _BODY_LENGTH.pack(len(body))
+            buffer += body
+            self._stored.add(fingerprint)
+
+        member = gzip.compress(bytes(buffer), mtime=0)
+        with open(self._segment, "ab") as segment:
+            segment.write(member)
+        self._segment_size += len(member)
+
+    def _start_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._segment = os.path.join(self.directory, f"{self.prefix}-{int(time.time() * 1000):013d}{SEGMENT_SUFFIX}")
+        self._segment_size = 0
+        self._stored = set()
+
+        # Drop the oldest segments beyond the size cap
+        segments = segment_paths(self.directory, self.prefix)
+        sizes = {path: os.path.getsize(path) for path in segments}
+        total = sum(sizes.values())
+        for path in segments:
+            if total <= LOG_MAX_BYTES:
+                break
+            os.remove(path)
+            total -= sizes[path]
+
+    def as_dict(self):
+        """Return counters for diagnostics."""
+        return {
+            "recorded": self.recorded,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "pending": len(self._pending),
+            "segment": os.path.basename(self._segment) if self._segment else None,
+        }
+
+
+# ---- Reading ----
+
+def segment_paths(directory, prefix=None):
+    """Return an entry's segment files (all entries when prefix is None), oldest first."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    # Names end in a fixed-width millisecond timestamp, so they sort by age per prefix
+    paths = [
+        os.path.join(directory, name) for name in names
+        if name.endswith(SEGMENT_SUFFIX) and (prefix is None or name.startswith(f"{prefix}-"))
+    ]
+    return sorted(paths, key=lambda path: path.rsplit("-", 1)[1])
+
+
+def iter_segment(path):
+    """Yield the PageRecords of one segment, resolving hash references."""
+    pages = {}
+    with gzip.open(path, "rb") as stream:
+        try:
+            while True:
+                kind = stream.read(1)
+                if not kind:
+                    return
+                if kind == b"R":
+                    _, timestamp, fingerprint = _REFERENCE.unpack(kind + _read_exact(stream, _REFERENCE.size - 1))
+                    body, encoding = pages[fingerprint]
+                else:
+                    _, timestamp, fingerprint, length = _PAGE.unpack(kind + _read_exact(stream, _PAGE.size - 1))
+                    encoding = _read_exact(stream, length).decode("ascii")
+                    (length,) = _BODY_LENGTH.unpack(_read_exact(stream, _BODY_LENGTH.size))
+                    body = _read_exact(stream, length)
+                    pages[fingerprint] = (body, encoding)
+                yield PageRecord(timestamp, fingerprint, body, encoding)
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            # Last batch was cut off (crash or power loss mid-write)
+            return
+
+
+def iter_log(directory, prefix=None):
+    """Yield the PageRecords of every segment in order."""
+    for path in segment_paths(directory, prefix):
+        yield from iter_segment(path)
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError
+    return data
@@ -0,0 +1,195 @@
+"""High-rate internal sampling of the inverter with windowed aggregation.
+
+Samples are kept per key in fixed-size, array-backed ring buffers, so memory
+stays constant however long HA runs. Aggregates are computed over contiguous
+memoryview slices with the C-level builtins (min/max/fsum) instead of a
+per-sample Python loop.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from array import array
+from bisect import bisect_left
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys sampled at high rate (PAC_TOTAL is derived from PACL1..3 per sample)
+SAMPLED_KEYS = (
+    "PAC_TOTAL",
+    "PACL1", "PACL2", "PACL3",
+    "UDC1", "UDC2", "UDC3",
+    "IDC1", "IDC2", "IDC3",
+    "UACL1", "UACL2", "UACL3",
+)
+
+# Samples kept per key; at 1 s sampling this covers 10 minutes
+SAMPLE_BUFFER_SIZE = 600
+
+
+def next_tick(now, interval, origin=0.0):
+    """Return the first point of the grid origin + k * interval strictly after now.
+
+    Scheduling on a fixed grid keeps sample times from drifting, and a tick
+    that is already past is skipped rather than run late.
+    """
+    return (math.floor((now - origin) / interval) + 1) * interval + origin
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer of (monotonic timestamp, float value) samples."""
+
+    def __init__(self, capacity=SAMPLE_BUFFER_SIZE):
+        self._capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._head = 0  # next physical write position
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, value):
+        """Add a sample, overwriting the oldest one when full."""
+        self._times[self._head] = timestamp
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def _physical(self, index):
+        """Map a logical index (0 = oldest sample) to its physical position."""
+        return (self._head - self._count + index) % self._capacity
+
+    def _segments(self, buffer, start):
+        """Return up to two contiguous memoryview slices for logical [start, count)."""
+        size = self._count - start
+        if size <= 0:
+            return ()
+        first = self._physical(start)
+        view = memoryview(buffer)
+        if first + size <= self._capacity:
+            return (view[first:first + size],)
+        return (view[first:], view[:first + size - self._capacity])
+
+    def index_since(self, since):
+        """Return the logical index of the first sample taken at or after since."""
+        return bisect_left(_LogicalView(self._times, self), since)
+
+    def window(self, since):
+        """Return (times, values) segment tuples for samples taken at or after since."""
+        start = self.index_since(since)
+        return self._segments(self._times, start), self._segments(self._values, start)
+
+    def aggregate(self, since):
+        """Return mean/min/max/last/samples over samples taken at or after since."""
+        _, segments = self.window(since)
+        count = sum(len(segment) for segment in segments)
+        if not count:
+            return None
+        return {
+            "mean": round(math.fsum(math.fsum(segment) for segment in segments) / count, 3),
+            "min": round(min(min(segment) for segment in segments), 3),
+            "max": round(max(max(segment) for segment in segments), 3),
+            "last": round(segments[-1][-1], 3),
+            "samples": count,
+        }
+
+
+class _LogicalView:
+    """Read-only sequence over a ring buffer array in logical order (for bisect)."""
+
+    __slots__ = ("_buffer", "_ring")
+
+    def __init__(self, buffer, ring):
+        self._buffer = buffer
+        self._ring = ring
+
+    def __len__(self):
+        return len(self._ring)
+
+    def __getitem__(self, index):
+        return self._buffer[self._ring._physical(index)]
+
+
+class SolutronicSampler:
+    """Samples one inverter at a high rate between the coordinator's publishes."""
+
+    def __init__(self, coordinator, interval):
+        self.coordinator = coordinator
+        self.interval = interval
+        self.buffers = {key: RingBuffer() for key in SAMPLED_KEYS}
+        self.last_page = None  # Most recent page that carried parsed data
+        self.last_sample_time = None
+
+    def is_fresh(self):
+        """Return True if the last sample is recent enough to stand in for a poll.
+
+        Never older than the fastest poll interval, so sampling can only make
+        the published data more current, not less.
+        """
+        max_age = min(2 * self.interval, self.coordinator.min_interval)
+        return (
+            self.last_page is not None
+            and self.last_sample_time is not None
+            and time.monotonic() - self.last_sample_time < max_age
+        )
+
+    def aggregates(self, since):
+        """Return per-key aggregates over samples taken at or after since."""
+        result = {}
+        for key, buffer in self.buffers.items():
+            aggregate = buffer.aggregate(since)
+            if aggregate is not None:
+                result[key] = aggregate
+        return result
+
+    async def async_run(self):
+        """Sample until cancelled (the task is owned by the config entry).
+
+        Samples run on a fixed grid: the wall clock's when the coordinator is
+        aligned to it, otherwise one anchored at the first sample. A sample
+        that overruns skips the ticks it missed instead of queueing them.
+        """
+        metrics = self.coordinator.metrics
+        origin = time.time()
+        due = None
+        while True:
+            if due is not None:
+                metrics.observe("sample_jitter", (time.time() - due) * 1000)
+            try:
+                await self._async_sample()
+                interval = self.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                # Let the coordinator handle outages; just back off to its pace
+                _LOGGER.debug("Solutronic sample failed (%s): %s", self.coordinator.ip_address, err)
+                self.last_sample_time = None
+                interval = self.coordinator.update_interval.total_seconds()
+
+            now = time.time()
+            previous, due = due, next_tick(now, interval, 0.0 if self.coordinator.align_to_clock else origin)
+            if previous is not None and interval == self.interval:
+                missed = round((due - previous) / interval) - 1
+                if missed > 0:
+                    metrics.increment("skipped_samples", missed)
+            await asyncio.sleep(due - now)
+
+    async def _async_sample(self):
+        """Fetch one page and push its values into the ring buffers."""
+        previous = self.last_page.fingerprint if self.last_page is not None else None
+        page = await self.coordinator.async_request_page(previous)
+        if page.data is not None:
+            self.last_page = page
+
+        now = time.monotonic()
+        self.last_sample_time = now
+        data = self.last_page.data
+
+        pac_values = [data[key] for key in ("PACL1", "PACL2", "PACL3") if isinstance(data.get(key), (int, float))]
+        for key, buffer in self.buffers.items():
+            value = sum(pac_values) if key == "PAC_TOTAL" and pac_values else data.get(key)
+            if isinstance(value, (int, float)):
+                buffer.append(now, value)
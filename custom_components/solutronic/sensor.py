@@ -3,9 +3,31 @@ from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorStateClass,
 )
+import time
+from typing import NamedTuple
+
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    DATA_HUB,
+    KEY_AGGREGATES,
+    KEY_STATISTICS,
+    CONF_DEADBAND_VOLTAGE,
+    CONF_DEADBAND_CURRENT,
+    CONF_DEADBAND_POWER,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_MAX_PUBLISH_AGE,
+    DEFAULT_DEADBAND_VOLTAGE,
+    DEFAULT_DEADBAND_CURRENT,
+    DEFAULT_DEADBAND_POWER,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_MAX_PUBLISH_AGE,
+)
 
 
 # Dictionary defining all sensors exposed by this integration.
@@ -35,31 +57,166 @@ SENSORS = {
     # Derived lifetime energy (smooth, continuous, no reset spike)
     "LIFETIME_DERIVED": ("Total produktion", "kWh", SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, "mdi:solar-power"),
 
+    # Lifetime energy integrated from PAC_TOTAL (high resolution, reconciled to ET/EG)
+    "LIFETIME_INTEGRATED": ("Total produktion (integreret)", "kWh", SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, "mdi:sigma"),
+
     "MAXP": ("Maks. Effekt i dag", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:trending-up"),
     "ETA": ("Effektivitet", "%", None, SensorStateClass.MEASUREMENT, "mdi:percent"),
     "UACL1": ("Netspænding L1", "V", SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, "mdi:flash"),
     "UACL2": ("Netspænding L2", "V", SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, "mdi:flash"),
     "UACL3": ("Netspænding L3", "V", SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT, "mdi:flash"),
+
+    # --- Streaming analytics (computed by the coordinator per poll) ---
+    "PDC1": ("DC Effekt 1", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:solar-panel-large"),
+    "PDC2": ("DC Effekt 2", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:solar-panel-large"),
+    "PDC3": ("DC Effekt 3", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:solar-panel-large"),
+    "PHASE_IMBALANCE": ("Fase-ubalance", "%", None, SensorStateClass.MEASUREMENT, "mdi:scale-unbalanced"),
+    "PAC_MEAN": ("AC Effekt gennemsnit", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:chart-bell-curve"),
+    "PAC_STDDEV": ("AC Effekt standardafvigelse", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:sigma-lower"),
+}
+
+# Keys computed by the coordinator rather than read from the inverter table;
+# their sensors exist for every model
+DERIVED_KEYS = ("PAC_TOTAL", "LIFETIME_DERIVED", "LIFETIME_INTEGRATED", "PAC_MEAN", "PAC_STDDEV")
+
+# Analytics that only make sense when the model reports all of their inputs
+ANALYTICS_INPUTS = {
+    "PDC1": ("UDC1", "IDC1"),
+    "PDC2": ("UDC2", "IDC2"),
+    "PDC3": ("UDC3", "IDC3"),
+    "PHASE_IMBALANCE": ("PACL1", "PACL2"),
+}
+
+
+def _is_supported(key, supported):
+    """Return True if a sensor for key belongs to a model reporting supported."""
+    if key in supported or key in DERIVED_KEYS:
+        return True
+    inputs = ANALYTICS_INPUTS.get(key)
+    return inputs is not None and all(name in supported for name in inputs)
+
+
+# Publishing policy per key: (deadband option, default, relative deadband?)
+# Keys not listed here (ET, EG, LIFETIME_*) are energy counters and are
+# always published exactly.
+PUBLISH_POLICY = {
+    "PAC_TOTAL": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PACL1": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PACL2": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PACL3": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "UDC1": (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, False),
+    "UDC2": (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, False),
+    "UDC3": (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, False),
+    "IDC1": (CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT, False),
+    "IDC2": (CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT, False),
+    "IDC3": (CONF_DEADBAND_CURRENT, DEFAULT_DEADBAND_CURRENT, False),
+    "UACL1": (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, False),
+    "UACL2": (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, False),
+    "UACL3": (CONF_DEADBAND_VOLTAGE, DEFAULT_DEADBAND_VOLTAGE, False),
+    "PDC1": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PDC2": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PDC3": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PAC_MEAN": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
+    "PAC_STDDEV": (CONF_DEADBAND_POWER, DEFAULT_DEADBAND_POWER, True),
 }
 
 
+# Attributes recomputed on every poll (by coordinator data key): sampler
+# aggregates and the rolling PAC statistics. They do not force a write of
+# their own; they go out with the rate-limited state.
+FOLLOWING_ATTRIBUTES = (KEY_AGGREGATES, KEY_STATISTICS)
+
+
+class PublishPolicy(NamedTuple):
+    """When a changed value is worth writing to the state machine."""
+
+    deadband: float  # absolute units, or percent when relative
+    relative: bool
+    min_interval: float  # seconds between publishes
+    max_age: float  # seconds after which a pending change is always published
+
+    def suppresses(self, new, old, age):
+        """Return True if publishing new (last published: old, age seconds ago) can wait."""
+        if age >= self.max_age:
+            return False
+        if age < self.min_interval:
+            return True
+        if not isinstance(new, (int, float)) or not isinstance(old, (int, float)):
+            return False
+        band = abs(old) * self.deadband / 100 if self.relative else self.deadband
+        return abs(new - old) < band
+
+
+def build_publish_policies(options):
+    """Build the per-key publishing policies from the entry options."""
+    min_interval = options.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL)
+    max_age = options.get(CONF_MAX_PUBLISH_AGE, DEFAULT_MAX_PUBLISH_AGE)
+    return {
+        key: PublishPolicy(options.get(option, default), relative, min_interval, max_age)
+        for key, (option, default, relative) in PUBLISH_POLICY.items()
+    }
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up sensors when config entry is added."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    policies = build_publish_policies(entry.options)
+    added = set()
+    synced = None  # (reported keys, confirmed) the entities were last synced to
+
+    @callback
+    def _async_sync_entities():
+        """Add sensors for keys this model reports; drop ones it never reports."""
+        nonlocal synced
+        reported = coordinator.reported_keys
+        state = (reported, coordinator.reported_keys_confirmed)
+        if reported is not None and state == synced:
+            return
+        # Until the layout is known, go by the restored data (if any)
+        supported = reported if reported is not None else frozenset(coordinator.data or ())
+
+        new_keys = [
+            key for key in SENSORS
+            if key not in added and _is_supported(key, supported)
+        ]
+        if new_keys:
+            added.update(new_keys)
+            async_add_entities(
+                SolutronicSensor(coordinator, entry.entry_id, key, *SENSORS[key], policy=policies.get(key))
+                for key in new_keys
+            )
+
+        if reported is not None and coordinator.reported_keys_confirmed:
+            # e.g. L2/L3 entities created for a single-phase unit before this was known;
+            # only once several pages agreed, so a partial page cannot delete entities
+            registry = er.async_get(hass)
+            for key in SENSORS:
+                if _is_supported(key, reported):
+                    continue
+                entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_{key}")
+                if entity_id is not None:
+                    registry.async_remove(entity_id)
+                added.discard(key)
+        if reported is not None:
+            synced = state
 
-    entities = [
-        SolutronicSensor(coordinator, entry.entry_id, key, *values)
-        for key, values in SENSORS.items()
-    ]
+    _async_sync_entities()
+    entry.async_on_unload(coordinator.async_add_listener(_async_sync_entities))
 
-    async_add_entities(entities)
+    async_add_entities(
+        SolutronicDiagnosticSensor(coordinator, entry.entry_id, key) for key in DIAGNOSTIC_SENSORS
+    )
+
+    # Fleet totals are added by the hub once more than one inverter is configured
+    hass.data[DOMAIN][DATA_HUB].async_setup_fleet(entry.entry_id, async_add_entities)
 
 
 class SolutronicSensor(CoordinatorEntity, SensorEntity):
     """Representation of a sensor using the shared update coordinator."""
 
-    def __init__(self, coordinator, entry_id, key, name, unit, device_class, state_class, icon):
+    def __init__(self, coordinator, entry_id, key, name, unit, device_class, state_class, icon, policy=None):
         super().__init__(coordinator)
+        self._policy = policy
         self._key = key
         self._entry_id = entry_id
         self._attr_name = name
@@ -68,15 +225,88 @@ class SolutronicSensor(CoordinatorEntity, SensorEntity):
         self._attr_state_class = state_class
         self._attr_icon = icon
         self._attr_unique_id = f"{entry_id}_{key}"
+        self._last_written = None  # (value, available, attributes) of the last state write
+        self._last_write_time = 0.0
+        self._unsub_pending = None  # timer publishing a held-back value at max_age
 
         # Mark inverter internal total (EG) as diagnostic
         if key == "EG":
-            self._attr_entity_category = "diagnostic"
+            self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only when this sensor's own value, availability or attributes changed.
+
+        Value changes additionally go through the key's publishing policy, and
+        so do FOLLOWING_ATTRIBUTES, which are published along with the value.
+        """
+        source, attributes = self._attribute_source()
+        current = (self.native_value, self.available, attributes)
+        if current == self._last_written:
+            return
+
+        now = time.monotonic()
+        age = now - self._last_write_time
+        if (
+            self._policy is not None
+            and self._last_written is not None
+            and current[1] == self._last_written[1]
+            and (current[2] == self._last_written[2] or source in FOLLOWING_ATTRIBUTES)
+            and self._policy.suppresses(current[0], self._last_written[0], age)
+        ):
+            self.coordinator.suppressed_writes += 1
+            # The coordinator may not update again (identical data overnight);
+            # make sure the held-back value still goes out at max_age
+            if self._unsub_pending is None:
+                self._unsub_pending = async_call_later(
+                    self.hass, max(self._policy.max_age - age, 0), self._async_publish_pending
+                )
+            return
+
+        self._cancel_pending()
+        self._last_written = current
+        self._last_write_time = now
+        self.async_write_ha_state()
+
+    @callback
+    def _async_publish_pending(self, _now):
+        """Publish the value held back by the policy once it reached max_age."""
+        self._unsub_pending = None
+        current = (self.native_value, self.available, self.extra_state_attributes)
+        if current != self._last_written:
+            self._last_written = current
+            self._last_write_time = time.monotonic()
+            self.async_write_ha_state()
+
+    @callback
+    def _cancel_pending(self):
+        if self._unsub_pending is not None:
+            self._unsub_pending()
+            self._unsub_pending = None
+
+    async def async_will_remove_from_hass(self):
+        """Drop a pending publish timer."""
+        self._cancel_pending()
+        await super().async_will_remove_from_hass()
 
     @property
     def native_value(self):
-        """Return the current sensor value."""
-        return self.coordinator.data.get(self._key)
+        """Return the current sensor value (None until a snapshot or poll exists)."""
+        return (self.coordinator.data or {}).get(self._key)
+
+    @property
+    def extra_state_attributes(self):
+        """Return sampler aggregates (if enabled) or the streaming analytics' attributes."""
+        return self._attribute_source()[1]
+
+    def _attribute_source(self):
+        """Return (coordinator data key, attributes) this sensor's attributes come from."""
+        data = self.coordinator.data or {}
+        for source in (KEY_AGGREGATES, KEY_STATISTICS):
+            attributes = (data.get(source) or {}).get(self._key)
+            if attributes is not None:
+                return source, attributes
+        return None, None
 
     @property
     def available(self):
@@ -94,4 +324,149 @@ class SolutronicSensor(CoordinatorEntity, SensorEntity):
             "sw_version": self.coordinator.device_firmware,
             "hw_version": getattr(self.coordinator, "device_serial", None),
             "configuration_url": f"http://{self.coordinator.ip_address}/",
-        }
\ No newline at end of file
+        }
+
+
+# Fleet-wide totals across all inverters handled by the hub.
+# KEY: (Friendly name, Unit, Device Class, State Class, Icon)
+FLEET_SENSORS = {
+    "PAC_TOTAL": ("Anlæg AC Effekt", "W", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "mdi:solar-power-variant"),
+    # Daily counter that resets at night: total_increasing (energy cannot be a measurement)
+    "ET": ("Anlæg Dagens Produktion", "kWh", SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, "mdi:solar-power-variant"),
+}
+
+
+class SolutronicFleetSensor(SensorEntity):
+    """Sum of one value across all inverters, computed by the hub without extra requests."""
+
+    _attr_should_poll = False
+
+    def __init__(self, hub, key):
+        name, unit, device_class, state_class, icon = FLEET_SENSORS[key]
+        self._hub = hub
+        self._key = key
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_icon = icon
+        self._attr_unique_id = f"{DOMAIN}_fleet_{key}"
+
+    async def async_added_to_hass(self):
+        """Subscribe to fleet total updates from the hub."""
+        self.async_on_remove(self._hub.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def available(self):
+        """Unavailable once fewer than two inverters are left (the total would be one inverter's)."""
+        return self._hub.fleet_active
+
+    @property
+    def native_value(self):
+        """Return the current fleet total."""
+        return self._hub.fleet_data.get(self._key)
+
+    @property
+    def device_info(self):
+        """Group fleet totals under their own device."""
+        return {
+            "identifiers": {(DOMAIN, "fleet")},
+            "name": "Solutronic Anlæg",
+            "manufacturer": "Solutronic",
+            "model": "Fleet",
+        }
+
+
+def _update_latency(coordinator):
+    """Return the last full update duration in ms."""
+    histogram = coordinator.metrics.stages.get("update")
+    return histogram.last if histogram else None
+
+
+def _update_latency_attributes(coordinator):
+    """Return rolling percentiles of the full update duration."""
+    histogram = coordinator.metrics.stages.get("update")
+    if histogram is None:
+        return None
+    return {
+        "p50_ms": histogram.percentile(0.5),
+        "p95_ms": histogram.percentile(0.95),
+        "p99_ms": histogram.percentile(0.99),
+    }
+
+
+def _tick_jitter(coordinator):
+    """Return how far the last scheduled poll started from its tick, in ms."""
+    histogram = coordinator.metrics.stages.get("tick_jitter")
+    return histogram.last if histogram else None
+
+
+def _tick_jitter_attributes(coordinator):
+    """Return rolling jitter percentiles and the number of skipped ticks."""
+    histogram = coordinator.metrics.stages.get("tick_jitter")
+    if histogram is None:
+        return None
+    counters = coordinator.metrics.counters
+    return {
+        "p50_ms": histogram.percentile(0.5),
+        "p99_ms": histogram.percentile(0.99),
+        "max_ms": round(histogram.max_ms, 2),
+        "skipped_ticks": counters.get("skipped_ticks", 0),
+        "skipped_samples": counters.get("skipped_samples", 0),
+    }
+
+
+# Diagnostic sensors built from coordinator internals (disabled by default).
+# KEY: (Friendly name, Unit, State Class, Icon, value function, attributes function)
+DIAGNOSTIC_SENSORS = {
+    "SUPPRESSED_WRITES": (
+        "Undertrykte skrivninger", None, SensorStateClass.TOTAL_INCREASING, "mdi:filter-variant-remove",
+        lambda c: c.suppressed_writes, None,
+    ),
+    "POLL_LATENCY": (
+        "Opdateringstid", "ms", SensorStateClass.MEASUREMENT, "mdi:timer-outline",
+        _update_latency, _update_latency_attributes,
+    ),
+    "POLL_JITTER": (
+        "Planlægningsafvigelse", "ms", SensorStateClass.MEASUREMENT, "mdi:timer-sand",
+        _tick_jitter, _tick_jitter_attributes,
+    ),
+    "POLL_FAILURES": (
+        "Fejlede opdateringer", None, SensorStateClass.TOTAL_INCREASING, "mdi:alert-circle-outline",
+        lambda c: c.metrics.counters.get("failures", 0), None,
+    ),
+}
+
+
+class SolutronicDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic value computed from the coordinator's own counters and timers."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, entry_id, key):
+        super().__init__(coordinator)
+        name, unit, state_class, icon, value_fn, attributes_fn = DIAGNOSTIC_SENSORS[key]
+        self._entry_id = entry_id
+        self._value_fn = value_fn
+        self._attributes_fn = attributes_fn
+        self._attr_name = name
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attr_icon = icon
+        self._attr_unique_id = f"{entry_id}_{key}"
+
+    @property
+    def native_value(self):
+        """Return the diagnostic value."""
+        return self._value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        """Return extra diagnostic detail, if any."""
+        return self._attributes_fn(self.coordinator) if self._attributes_fn else None
+
+    @property
+    def device_info(self):
+        """Attach to the inverter device."""
+        return {"identifiers": {(DOMAIN, self._entry_id)}}
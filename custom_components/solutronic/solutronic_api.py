@@ -1,15 +1,90 @@
 # All comments are in English (per your preference)
 
+import hashlib
+import logging
+import random
+import re
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from html.entities import html5
+from typing import NamedTuple, Optional
+
 import aiohttp
-from bs4 import BeautifulSoup
 import asyncio
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .metrics import metrics_for
+
+# bs4 (fallback parser) and the neighbour table reader are imported on first
+# use; most installations never need either
+
 # We will probe both typical ports and both paths
 PORTS_TO_TRY = (8888, 80)
 PATHS_TO_TRY = ("/solutronic/", "/")
 
+# How long a working base URL is trusted before probing again (seconds)
+BASE_URL_TTL = 7 * 24 * 3600
+# How long a failed port/path combination is skipped by the prober (seconds)
+DEAD_URL_TTL = 300
+
+# host -> (base_url, expires_at as wall-clock timestamp)
 _BASE_URL_CACHE = {}
+# url -> monotonic timestamp until which the combination is considered dead
+_DEAD_URL_CACHE = {}
+
+# Circuit breaker: consecutive failures before the host is considered down,
+# and the (jittered, doubling) time it is left alone before a single probe
+BREAKER_FAILURE_THRESHOLD = 2
+BREAKER_BASE_BACKOFF = 10  # seconds
+BREAKER_MAX_BACKOFF = 600  # seconds
+BREAKER_JITTER = 0.2  # +/- fraction of the backoff
+# The half-open probe is one GET of the last known endpoint with a short timeout
+HALF_OPEN_TIMEOUT = 3  # seconds
+
+# host -> CircuitBreaker
+_BREAKERS = {}
+
+# Learned telemetry table layouts: (host, firmware line, row count) -> TableSchema
+# (per host: two inverters on the same firmware may still differ in layout)
+_SCHEMAS = {}
+
+# Page decoding/parsing runs on a small dedicated pool unless it is cheap
+# enough to do inline: an executor hop costs more than parsing a small page
+PARSE_WORKERS = 2
+INLINE_PARSE_BUDGET_MS = 1.0  # smoothed decode+parse cost below which we stay inline
+SMALL_PAGE_BYTES = 16384  # before the first measurement, pages up to this size stay inline
+PARSE_COST_SMOOTHING = 0.2  # weight of the newest measurement in the moving average
+
+_parse_executor = None
+# host -> smoothed decode+parse cost in ms
+_PARSE_COST = {}
+
+# Single flight: callers asking for the same host while a request is running
+# share it, and a completed page (with its parse results) is served again for
+# a short while, so the inverter never sees more than one request from us
+RESPONSE_CACHE_TTL = 1.0  # seconds; callers may pass their own max_age (0 = no reuse)
+
+# host -> asyncio.Task of the request in flight
+_INFLIGHT = {}
+# host -> _SharedPage of the last completed request
+_RESPONSE_CACHE = {}
+
+_LOGGER = logging.getLogger(__name__)
+
+# Patterns used by the fast table extractor (case-insensitive, as embedded
+# web servers are not consistent about tag case)
+_TABLE_OPEN_RE = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+_TABLE_CLOSE_RE = re.compile(r"</table\s*>", re.IGNORECASE)
+_ROW_RE = re.compile(r"<tr\b[^>]*>", re.IGNORECASE)
+_ROW_CLOSE_RE = re.compile(r"</tr\s*>", re.IGNORECASE)
+_CELL_RE = re.compile(r"<td\b[^>]*>(.*?)</td\s*>", re.IGNORECASE | re.DOTALL)
+_CELL_OPEN_RE = re.compile(r"<td\b", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+_ENTITY_RE = re.compile(r"&([A-Za-z][A-Za-z0-9]*);")
+# Named references html.unescape knows; BeautifulSoup treats unknown ones differently
+_KNOWN_ENTITIES = frozenset(name[:-1] for name in html5 if name.endswith(";"))
 
 # A simple desktop-like User-Agent; some inverters behave better when this is present
 _DEFAULT_HEADERS = {
@@ -17,6 +92,18 @@ _DEFAULT_HEADERS = {
                   "(KHTML, like Gecko) Chrome/123.0 Safari/537.36"
 }
 
+# Connection pool tuned for the inverters' embedded web server, which copes
+# badly with parallel connections: one connection per host:port, kept alive
+# across polls instead of paying TCP setup every time
+SESSION_LIMIT = 16  # total connections across all inverters
+SESSION_LIMIT_PER_HOST = 1
+SESSION_KEEPALIVE_TIMEOUT = 120  # seconds an idle connection is kept open
+# Raw IPs never hit the resolver (aiohttp skips it); hostnames are cached this long
+SESSION_DNS_TTL = 3600  # seconds
+
+# Standalone session for calls made without hass or an explicit session
+_standalone_session = None
+
 
 def _build_url(ip: str, port: int, path: str) -> str:
     """Build a normalized URL with scheme, port and a single trailing slash."""
@@ -45,100 +132,456 @@ def _cache_key(ip: str) -> str:
     return host
 
 
-async def _probe_working_base(ip: str, hass=None, session=None) -> str:
-    """Try all port/path combos and return the first that responds with HTTP 200."""
+def get_cached_base_url(ip: str):
+    """Return (base_url, expires_at) for a host if a still-valid entry is cached."""
+    cached = _BASE_URL_CACHE.get(_cache_key(ip))
+    if cached is None:
+        return None
+    if cached[1] <= time.time():
+        _BASE_URL_CACHE.pop(_cache_key(ip), None)
+        return None
+    return cached
+
+
+def seed_base_url(ip: str, base_url: str, expires_at: float) -> None:
+    """Prime the base-URL cache, e.g. from a value persisted in the config entry."""
+    if base_url and expires_at and expires_at > time.time():
+        _BASE_URL_CACHE[_cache_key(ip)] = (base_url, expires_at)
+
+
+def invalidate_base_url(ip: str) -> None:
+    """Forget the cached base URL so the next request probes again."""
+    _BASE_URL_CACHE.pop(_cache_key(ip), None)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of doing any I/O while a host's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Per-host closed / open / half-open breaker with jittered exponential backoff."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self):
+        self.state = self.CLOSED
+        self.failures = 0  # consecutive failed requests
+        self.trips = 0  # consecutive times the breaker opened without a success
+        self.retry_at = 0.0  # monotonic time the next half-open probe is allowed
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return True if a request may go out now.
+
+        After the backoff expires exactly one caller is let through as the
+        half-open probe; everyone else is rejected until it reports back.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() >= self.retry_at:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    @property
+    def is_open(self) -> bool:
+        """True while requests are rejected (backoff running or probe in flight)."""
+        if self.state == self.OPEN:
+            return time.monotonic() < self.retry_at
+        return self.state == self.HALF_OPEN and self._probing
+
+    @property
+    def half_open(self) -> bool:
+        """True while the single half-open probe is in flight."""
+        return self.state == self.HALF_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failed request; return True if this opened the breaker."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self._trip()
+            return True
+        return False
+
+    def _trip(self):
+        self.trips += 1
+        backoff = min(BREAKER_BASE_BACKOFF * 2 ** (self.trips - 1), BREAKER_MAX_BACKOFF)
+        backoff *= random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        self.state = self.OPEN
+        self.retry_at = time.monotonic() + backoff
+        self._probing = False
+
+    def as_dict(self) -> dict:
+        """Return a JSON-friendly summary."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in": round(max(self.retry_at - time.monotonic(), 0), 1) if self.state == self.OPEN else None,
+        }
+
+
+def forget_host(ip: str) -> None:
+    """Drop cached per-host state (endpoint, breaker, last page), e.g. after the inverter moved."""
+    invalidate_base_url(ip)
+    _BREAKERS.pop(_cache_key(ip), None)
+    _RESPONSE_CACHE.pop(_cache_key(ip), None)
+    host = _cache_key(ip)
+    for layout in [layout for layout in _SCHEMAS if layout[0] == host]:
+        del _SCHEMAS[layout]
+
+
+def breaker_for(ip: str) -> CircuitBreaker:
+    """Return the circuit breaker for a host, creating it on first use."""
     key = _cache_key(ip)
-    if key in _BASE_URL_CACHE:
-        return _BASE_URL_CACHE[key]
+    breaker = _BREAKERS.get(key)
+    if breaker is None:
+        breaker = _BREAKERS[key] = CircuitBreaker()
+    return breaker
+
+
+def raise_if_circuit_open(ip: str) -> None:
+    """Raise CircuitOpenError if requests to the host are currently being rejected."""
+    breaker = _BREAKERS.get(_cache_key(ip))
+    if breaker is not None and breaker.is_open:
+        metrics_for(_cache_key(ip)).increment("breaker_rejections")
+        raise CircuitOpenError(f"Circuit open for {_cache_key(ip)}")
+
+
+async def _on_request_start(session, context, params):
+    context.host = params.url.host
+
+
+async def _on_connection_created(session, context, params):
+    metrics_for(context.host).increment("connections_created")
+
+
+async def _on_connection_reused(session, context, params):
+    metrics_for(context.host).increment("connections_reused")
+
+
+def _connection_trace_config() -> aiohttp.TraceConfig:
+    """Count new vs. reused connections per host into the poll metrics."""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_connection_create_end.append(_on_connection_created)
+    trace_config.on_connection_reuseconn.append(_on_connection_reused)
+    return trace_config
+
 
-    timeout = aiohttp.ClientTimeout(total=8)
+def create_session() -> aiohttp.ClientSession:
+    """Create a keep-alive session tuned for Solutronic inverters.
+
+    The User-Agent is set once as a session default. The caller owns the
+    session and must close it.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=SESSION_LIMIT,
+        limit_per_host=SESSION_LIMIT_PER_HOST,
+        keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+        family=socket.AF_INET,  # The inverters are IPv4-only; skip AAAA lookups
+        ttl_dns_cache=SESSION_DNS_TTL,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=_DEFAULT_HEADERS,
+        trace_configs=[_connection_trace_config()],
+    )
+
+
+def _get_standalone_session() -> aiohttp.ClientSession:
+    """Return a reusable session for use outside Home Assistant (scripts, tools)."""
+    global _standalone_session
+    if _standalone_session is None or _standalone_session.closed:
+        _standalone_session = create_session()
+    return _standalone_session
+
+
+async def async_close_standalone_session() -> None:
+    """Close the session used for calls made without hass or a session."""
+    global _standalone_session
+    if _standalone_session is not None:
+        await _standalone_session.close()
+        _standalone_session = None
+
+
+async def _probe_url(session, url: str, timeout) -> str:
+    """Return url if it answers HTTP 200, otherwise raise."""
+    async with session.get(url, timeout=timeout) as resp:
+        # Many Solutronic pages return 200 with an HTML table right on root
+        if resp.status != 200:
+            raise ConnectionError(f"{url} answered HTTP {resp.status}")
+        return url
+
+
+async def _probe_working_base(ip: str, hass=None, session=None, timeout=None) -> str:
+    """Race all port/path combos and return the first that responds with HTTP 200."""
+    cached = get_cached_base_url(ip)
+    if cached is not None:
+        return cached[0]
+
+    metrics = metrics_for(_cache_key(ip))
+    metrics.increment("probes")
+    started = time.perf_counter()
+
+    timeout = timeout or aiohttp.ClientTimeout(total=8)
+
+    # Skip combinations that recently failed, unless nothing else is left
+    now = time.monotonic()
+    urls = [_build_url(ip, port, path) for port in PORTS_TO_TRY for path in PATHS_TO_TRY]
+    candidates = [url for url in urls if _DEAD_URL_CACHE.get(url, 0) <= now]
+    if not candidates:
+        candidates = urls
 
-    owns_session = False
     if session is None:
-        if hass is not None:
-            session = async_get_clientsession(hass)
-        else:
-            session = aiohttp.ClientSession(timeout=timeout, headers=_DEFAULT_HEADERS)
-            owns_session = True
+        session = async_get_clientsession(hass) if hass is not None else _get_standalone_session()
 
+    tasks = {asyncio.ensure_future(_probe_url(session, url, timeout)): url for url in candidates}
     try:
-        for port in PORTS_TO_TRY:
-            for path in PATHS_TO_TRY:
-                url = _build_url(ip, port, path)
-                try:
-                    async with session.get(url, timeout=timeout) as resp:
-                        # Many Solutronic pages return 200 with an HTML table right on root
-                        if resp.status == 200:
-                            _BASE_URL_CACHE[key] = url
-                            return url
-                except Exception:
-                    continue
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                url = tasks[task]
+                if task.exception() is None:
+                    _DEAD_URL_CACHE.pop(url, None)
+                    _BASE_URL_CACHE[_cache_key(ip)] = (url, time.time() + BASE_URL_TTL)
+                    return url
+                _DEAD_URL_CACHE[url] = time.monotonic() + DEAD_URL_TTL
     finally:
-        if owns_session:
-            await session.close()
+        # Cancel the losers of the race and let them unwind before closing the session
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        metrics.observe("probe", (time.perf_counter() - started) * 1000)
 
     raise ConnectionError(f"No responding Solutronic endpoint found on {ip} "
                           f"for ports {PORTS_TO_TRY} and paths {PATHS_TO_TRY}.")
 
 
-async def async_get_raw_html(ip_address: str, hass=None) -> str:
-    """Return raw HTML from whichever endpoint is working."""
-    timeout = aiohttp.ClientTimeout(total=10)
+async def _async_get(session, url: str, timeout, metrics):
+    """GET url and return (body bytes, encoding)."""
+    with metrics.time("http"):
+        async with session.get(url, timeout=timeout) as response:
+            body = await response.read()
+            return body, response.get_encoding()
+
+
+async def _async_fetch_with_session(ip_address: str, session, timeout, reprobe=True):
+    """GET the inverter page through session, reprobing once if the cached base fails.
 
-    if hass is not None:
-        session = async_get_clientsession(hass)
+    Returns the raw body bytes and the encoding to decode them with. With
+    reprobe=False a failure of the known endpoint is raised straight away.
+    """
+    metrics = metrics_for(_cache_key(ip_address))
+    base = await _probe_working_base(ip_address, session=session, timeout=None if reprobe else timeout)
+    try:
         try:
-            base = await _probe_working_base(ip_address, hass=hass, session=session)
-            try:
-                async with session.get(base, timeout=timeout) as response:
-                    return await response.text()
-            except Exception:
-                # Cached base might be stale; clear and reprobe once
-                _BASE_URL_CACHE.pop(_cache_key(ip_address), None)
-                base = await _probe_working_base(ip_address, hass=hass, session=session)
-                async with session.get(base, timeout=timeout) as response:
-                    return await response.text()
-        except Exception:
+            return await _async_get(session, base, timeout, metrics)
+        except aiohttp.ServerDisconnectedError:
+            # The inverter dropped an idle keep-alive connection; the endpoint
+            # itself is fine, so retry once on a fresh connection
+            metrics.increment("stale_connections")
+            return await _async_get(session, base, timeout, metrics)
+    except Exception:
+        if not reprobe:
+            # Still forget the endpoint, so the next attempt races all candidates
+            invalidate_base_url(ip_address)
             raise
-
-    async with aiohttp.ClientSession(timeout=timeout, headers=_DEFAULT_HEADERS) as session:
+        # Cached base might be stale; clear and reprobe once
+        metrics.increment("retries")
+        invalidate_base_url(ip_address)
         base = await _probe_working_base(ip_address, session=session)
-        try:
-            async with session.get(base) as response:
-                return await response.text()
-        except Exception:
-            _BASE_URL_CACHE.pop(_cache_key(ip_address), None)
-            base = await _probe_working_base(ip_address, session=session)
-            async with session.get(base) as response:
-                return await response.text()
+        return await _async_get(session, base, timeout, metrics)
 
 
-async def async_get_sensor_data(ip_address: str, hass=None):
-    """Fetch and parse inverter telemetry from the discovered working endpoint."""
-    timeout = aiohttp.ClientTimeout(total=10)
+async def _async_fetch_page(ip_address: str, hass=None, session=None, cheap=False):
+    """Return (body bytes, encoding) from whichever endpoint is working (single GET per call).
 
-    if hass is not None:
-        session = async_get_clientsession(hass)
-        base = await _probe_working_base(ip_address, hass=hass, session=session)
-        try:
-            async with session.get(base, timeout=timeout) as response:
-                html_data = await response.text()
-        except Exception:
-            _BASE_URL_CACHE.pop(_cache_key(ip_address), None)
-            base = await _probe_working_base(ip_address, hass=hass, session=session)
-            async with session.get(base, timeout=timeout) as response:
-                html_data = await response.text()
-    else:
-        async with aiohttp.ClientSession(timeout=timeout, headers=_DEFAULT_HEADERS) as session:
-            base = await _probe_working_base(ip_address, session=session)
+    cheap=True is the circuit breaker's half-open probe: one short GET, no reprobe.
+    """
+    timeout = aiohttp.ClientTimeout(total=HALF_OPEN_TIMEOUT if cheap else 10)
+
+    if session is None:
+        session = async_get_clientsession(hass) if hass is not None else _get_standalone_session()
+
+    return await _async_fetch_with_session(ip_address, session, timeout, reprobe=not cheap)
+
+
+async def _async_fetch_page_guarded(ip_address: str, hass=None, session=None):
+    """Fetch the page through the host's circuit breaker.
+
+    Raises CircuitOpenError without touching the network while the breaker is
+    open. Cancellation (e.g. unload) is not counted as a failure.
+    """
+    key = _cache_key(ip_address)
+    breaker = breaker_for(key)
+    metrics = metrics_for(key)
+
+    if not breaker.allow():
+        metrics.increment("breaker_rejections")
+        raise CircuitOpenError(f"Circuit open for {key}; retrying in "
+                               f"{max(breaker.retry_at - time.monotonic(), 0):.0f}s")
+
+    try:
+        result = await _async_fetch_page(ip_address, hass, session, cheap=breaker.half_open)
+    except asyncio.CancelledError:
+        if breaker.half_open:
+            breaker.record_failure()
+        raise
+    except Exception:
+        if breaker.record_failure():
+            metrics.increment("breaker_trips")
+            _LOGGER.debug("Solutronic (%s): circuit opened (%s)", key, breaker.as_dict())
+        raise
+
+    breaker.record_success()
+    return result
+
+
+def page_fingerprint(body: bytes) -> bytes:
+    """Return a compact content fingerprint of a raw inverter page."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def _convert_value(raw_value: str):
+    """Convert a table cell to float (comma decimals allowed), else keep the string."""
+    raw_value = raw_value.replace("\xa0", "").strip()
+    try:
+        return float(raw_value.replace(",", "."))
+    except ValueError:
+        return raw_value
+
+
+def _cell_text(fragment: str) -> str:
+    """Mimic BeautifulSoup's get_text(strip=True) for a single <td> body."""
+    if "<" not in fragment and "&" not in fragment:
+        return fragment.strip()
+    pieces = _TAG_RE.split(fragment)
+    return "".join(
+        text for text in (unescape(piece).strip() for piece in pieces) if text
+    )
+
+
+def _key_fingerprint(key_cells):
+    """Return a fingerprint of a table's key column (raw cell markup, in row order)."""
+    return hashlib.blake2b("\0".join(key_cells).encode(), digest_size=8).digest()
+
+
+class TableSchema:
+    """Learned layout of the telemetry table: which row holds which key.
+
+    Learned from one full parse and reused for every later page with the same
+    firmware, row count and key column, so only the wanted values are decoded.
+    """
+
+    __slots__ = ("row_count", "fields", "fingerprint", "_selections")
+
+    def __init__(self, row_count, fields, key_cells):
+        self.row_count = row_count
+        # (row index, key, value was numeric) for every 4-column row
+        self.fields = tuple(fields)
+        self.fingerprint = _key_fingerprint(key_cells)
+        self._selections = {}
+
+    def select(self, keys):
+        """Return the fields to extract for a set of wanted keys (None = all)."""
+        selection = self._selections.get(keys)
+        if selection is None:
+            selection = self._selections[keys] = tuple(
+                field for field in self.fields if keys is None or field[1] in keys
+            )
+        return selection
+
+
+def _split_table_rows(html_data: str):
+    """Return the row fragments of the first <table> ([] without a table).
+
+    Returns None for markup the regex extractors do not handle (no </table>,
+    nested tables, comments/CDATA, unknown entities), so the caller can fall
+    back to BeautifulSoup.
+    """
+    start = _TABLE_OPEN_RE.search(html_data)
+    if start is None:
+        return []
+
+    end = _TABLE_CLOSE_RE.search(html_data, start.end())
+    if end is None:
+        return None
+
+    table = html_data[start.end():end.start()]
+    if "<!" in table or _TABLE_OPEN_RE.search(table):
+        return None
+    if "&" in table and not _KNOWN_ENTITIES.issuperset(_ENTITY_RE.findall(table)):
+        return None
+
+    return _ROW_RE.split(table)[1:]
+
+
+def _parse_rows_full(rows):
+    """Parse every row; return (data, learned schema), or None if the markup is odd."""
+    data = {}
+    fields = []
+    key_cells = []
+
+    for index, row in enumerate(rows):
+        # Unclosed rows/cells nest differently in BeautifulSoup; let it decide
+        if _ROW_CLOSE_RE.search(row) is None:
+            return None
+        cells = _CELL_RE.findall(row)
+        if len(cells) != len(_CELL_OPEN_RE.findall(row)):
+            return None
+        if len(cells) == 4:
+            key = _cell_text(cells[1])
+            value = _convert_value(_cell_text(cells[3]))
+            data[key] = value
+            fields.append((index, key, isinstance(value, float)))
+            key_cells.append(cells[1])
+
+    return data, TableSchema(len(rows), fields, key_cells)
+
+
+def _parse_rows_learned(rows, schema, keys):
+    """Extract only the wanted keys at their learned row positions.
+
+    Returns None when the page's key column does not match the schema's
+    fingerprint (rows added, removed, renamed or reordered: relearn needed).
+    """
+    if len(rows) != schema.row_count:
+        return None
+
+    table = [_CELL_RE.findall(row) for row in rows]
+    if _key_fingerprint(cells[1] for cells in table if len(cells) == 4) != schema.fingerprint:
+        return None
+
+    data = {}
+    for index, key, numeric in schema.select(keys):
+        text = _cell_text(table[index][3])
+        if numeric:
             try:
-                async with session.get(base) as response:
-                    html_data = await response.text()
-            except Exception:
-                _BASE_URL_CACHE.pop(_cache_key(ip_address), None)
-                base = await _probe_working_base(ip_address, session=session)
-                async with session.get(base) as response:
-                    html_data = await response.text()
+                data[key] = float(text.replace("\xa0", "").replace(",", "."))
+                continue
+            except ValueError:
+                pass  # e.g. "---" while the inverter starts up
+        data[key] = _convert_value(text)
+    return data
+
+
+def _parse_sensor_table_soup(html_data: str) -> dict:
+    """Parse the 4-column telemetry table with BeautifulSoup (fallback path)."""
+    from bs4 import BeautifulSoup
 
     soup = BeautifulSoup(html_data, "html.parser")
     table = soup.find("table")
@@ -150,29 +593,296 @@ async def async_get_sensor_data(ip_address: str, hass=None):
             cols = row.find_all("td")
             if len(cols) == 4:
                 key = cols[1].get_text(strip=True)
-                raw_value = cols[3].get_text(strip=True).replace("\xa0", "").strip()
-                # Try numeric conversion; fall back to the original string
-                try:
-                    value = float(raw_value.replace(",", "."))
-                except ValueError:
-                    value = raw_value
-                data[key] = value
+                data[key] = _convert_value(cols[3].get_text(strip=True))
 
     return data
 
 
-async def async_get_mac(ip_address: str):
-    """Return MAC address for the device using ARP lookup (if available)."""
-    proc = await asyncio.create_subprocess_shell(
-        f"arp -n {ip_address}",
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    stdout, _ = await proc.communicate()
-    output = stdout.decode().lower()
+def _parse_sensor_table(html_data: str, metrics=None, keys=None, firmware=None, allow_soup=True, host=None):
+    """Parse the 4-column telemetry table into {key: float|str}.
+
+    With a firmware given, the table layout of `host` is learned on the first parse and
+    later pages only extract `keys` (a frozenset, None = all) by row position.
+    A page that does not match its learned layout is fully parsed and relearned.
+    With allow_soup=False, None is returned instead of using the slow fallback.
+    """
+    rows = _split_table_rows(html_data)
+    if rows is not None:
+        layout = (host, firmware, len(rows)) if firmware is not None else None
+        schema = _SCHEMAS.get(layout) if layout is not None else None
+        if schema is not None:
+            data = _parse_rows_learned(rows, schema, keys)
+            if data is not None:
+                return data
+            _LOGGER.debug("Solutronic table layout changed (firmware %s); relearning", firmware)
+            if metrics is not None:
+                metrics.increment("schema_mismatches")
+
+        parsed = _parse_rows_full(rows)
+        if parsed is not None:
+            data, schema = parsed
+            if layout is not None:
+                _SCHEMAS[layout] = schema
+                if metrics is not None:
+                    metrics.increment("schemas_learned")
+            if keys is not None:
+                data = {key: value for key, value in data.items() if key in keys}
+            return data
+
+    if not allow_soup:
+        return None
+    _LOGGER.debug("Fast table extractor could not handle page; using BeautifulSoup")
+    if metrics is not None:
+        metrics.increment("soup_fallbacks")
+    data = _parse_sensor_table_soup(html_data)
+    if keys is not None:
+        data = {key: value for key, value in data.items() if key in keys}
+    return data
+
+
+class _PendingCounters(dict):
+    """Counter increments collected off the event loop, applied to metrics afterwards."""
+
+    def increment(self, counter, amount=1):
+        self[counter] = self.get(counter, 0) + amount
+
+
+def _decode_and_parse(host: str, body: bytes, encoding: str, keys, allow_soup=True):
+    """Decode and parse one page (thread-safe; runs inline or in the parse pool).
+
+    Returns (data, header, decode ms, parse ms, counter increments); data is
+    None if the page needs the BeautifulSoup fallback and allow_soup is False.
+    """
+    counters = _PendingCounters()
+    started = time.perf_counter()
+    html_data = body.decode(encoding)
+    decoded = time.perf_counter()
+    header = extract_metadata_header(html_data)
+    data = _parse_sensor_table(html_data, counters, keys, firmware=header[1], allow_soup=allow_soup, host=host)
+    parsed = time.perf_counter()
+    return data, header, (decoded - started) * 1000, (parsed - decoded) * 1000, counters
+
+
+def _get_parse_executor() -> ThreadPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        _parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="solutronic_parse")
+    return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    """Release the parse pool's threads (recreated on next use)."""
+    global _parse_executor
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=False)
+        _parse_executor = None
+
+
+def _parse_inline(host: str, size: int) -> bool:
+    """Decide whether a page is cheap enough to parse on the event loop."""
+    cost = _PARSE_COST.get(host)
+    if cost is None:
+        return size <= SMALL_PAGE_BYTES
+    return cost <= INLINE_PARSE_BUDGET_MS
+
+
+async def _async_decode_and_parse(host: str, body: bytes, encoding: str, keys, metrics):
+    """Decode and parse inline or in the parse pool, recording per-stage timings."""
+    result = None
+    if _parse_inline(host, len(body)):
+        # The slow fallback (and the bs4 import) never runs on the loop
+        result = _decode_and_parse(host, body, encoding, keys, allow_soup=False)
+        if result[0] is not None:
+            metrics.increment("parse_inline")
+        else:
+            result = None
+
+    if result is None:
+        metrics.increment("parse_offloaded")
+        started = time.perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(
+            _get_parse_executor(), _decode_and_parse, host, body, encoding, keys
+        )
+        # Wall time the poll waited for the pool (the loop was free meanwhile)
+        metrics.observe("parse_wait", (time.perf_counter() - started) * 1000)
+
+    data, header, decode_ms, parse_ms, counters = result
+    metrics.observe("decode", decode_ms)
+    metrics.observe("parse", parse_ms)
+    for counter, amount in counters.items():
+        metrics.increment(counter, amount)
+
+    cost = decode_ms + parse_ms
+    previous = _PARSE_COST.get(host)
+    _PARSE_COST[host] = cost if previous is None else previous + PARSE_COST_SMOOTHING * (cost - previous)
+    return data, header
+
+
+def extract_metadata_header(html_data: str) -> tuple:
+    """Return the raw page fragments that carry device metadata.
+
+    This is the <h1> header plus the FW-Release line. The coordinator compares
+    it between polls and only re-parses metadata when it actually changes.
+    """
+    header = ""
+    if "<h1>" in html_data:
+        header = html_data.split("<h1>", 1)[1].split("</h1>", 1)[0]
+
+    fw_line = ""
+    if "FW-Release:" in html_data:
+        fw_line = html_data.split("FW-Release:", 1)[1].split("<", 1)[0]
+
+    return header, fw_line
+
+
+def parse_device_metadata(header: tuple) -> dict:
+    """Parse manufacturer, model and firmware from an extracted metadata header.
+
+    Only fields that could be found are returned.
+    """
+    metadata = {}
+    h1, fw_line = header
+
+    # Extract manufacturer and model from <h1> header
+    parts = [line.strip() for line in h1.replace("<br>", "\n").split("\n") if line.strip()]
+    if len(parts) >= 2:
+        metadata["model"] = parts[0]
+        metadata["manufacturer"] = parts[1]
+
+    # Extract firmware version
+    fw_line = fw_line.strip()
+    if fw_line:
+        metadata["firmware"] = fw_line
+
+    return metadata
+
+
+class InverterPage(NamedTuple):
+    """Result of one inverter poll."""
+
+    # Parsed telemetry and metadata header; None when the page is unchanged
+    data: Optional[dict]
+    header: Optional[tuple]
+    fingerprint: bytes
+    # Raw page as fetched (for the page log)
+    body: Optional[bytes] = None
+    encoding: Optional[str] = None
+
+
+class _SharedPage:
+    """One fetched page, shared by every caller that asked for it."""
+
+    def __init__(self, body: bytes, encoding: str):
+        self.body = body
+        self.encoding = encoding
+        self.fingerprint = page_fingerprint(body)
+        self.fetched_at = time.monotonic()
+        self.parsed = {}  # keys -> task returning (data, header)
+
+
+async def _async_fetch_and_share(host: str, ip_address: str, hass, session, use_breaker: bool):
+    """Run the one request for a host and publish the page to the cache."""
+    try:
+        if use_breaker:
+            body, encoding = await _async_fetch_page_guarded(ip_address, hass, session)
+        else:
+            body, encoding = await _async_fetch_page(ip_address, hass, session)
+        page = _RESPONSE_CACHE[host] = _SharedPage(body, encoding)
+        return page
+    finally:
+        _INFLIGHT.pop(host, None)
+
+
+async def _async_fetch_shared(ip_address: str, hass=None, session=None, use_breaker=True, max_age=None):
+    """Return the host's page, joining a request in flight or reusing a recent one.
+
+    The request runs as its own task: a caller that is cancelled (e.g. on
+    unload) does not cancel it for the others.
+    """
+    host = _cache_key(ip_address)
+    metrics = metrics_for(host)
+    max_age = RESPONSE_CACHE_TTL if max_age is None else max_age
+
+    cached = _RESPONSE_CACHE.get(host)
+    if cached is not None and time.monotonic() - cached.fetched_at <= max_age:
+        metrics.increment("cache_hits")
+        return cached
+
+    task = _INFLIGHT.get(host)
+    if task is None:
+        task = _INFLIGHT[host] = asyncio.ensure_future(
+            _async_fetch_and_share(host, ip_address, hass, session, use_breaker)
+        )
+    else:
+        metrics.increment("coalesced")
+
+    try:
+        return await asyncio.shield(task)
+    except CircuitOpenError:
+        if use_breaker:
+            raise
+        # Joined a poll the breaker rejected; one-off checks go out regardless
+        return await _async_fetch_shared(ip_address, hass, session, use_breaker=False, max_age=0)
+
+
+async def _async_parse_shared(page: _SharedPage, host: str, keys, metrics):
+    """Decode and parse a shared page once per key set."""
+    task = page.parsed.get(keys)
+    if task is None:
+        task = page.parsed[keys] = asyncio.ensure_future(
+            _async_decode_and_parse(host, page.body, page.encoding, keys, metrics)
+        )
+    else:
+        metrics.increment("parse_reused")
+    return await asyncio.shield(task)
+
+
+async def async_get_inverter_data(
+    ip_address: str, hass=None, session=None, previous_fingerprint=None, use_breaker=True, keys=None,
+    max_age=None,
+):
+    """Fetch the inverter page once and return telemetry and metadata header.
+
+    When the page is byte-for-byte identical to previous_fingerprint, decoding
+    and parsing are skipped and data/header are None. Polling goes through the
+    host's circuit breaker; one-off checks (config flow) pass use_breaker=False.
+    keys (a frozenset) limits the telemetry to the keys the caller uses.
+    Concurrent callers share one request, and a page at most max_age seconds
+    old (default RESPONSE_CACHE_TTL) is reused without a request.
+    """
+    host = _cache_key(ip_address)
+    metrics = metrics_for(host)
+    page = await _async_fetch_shared(ip_address, hass, session, use_breaker, max_age)
+    if page.fingerprint == previous_fingerprint:
+        metrics.increment("unchanged_pages")
+        return InverterPage(None, None, page.fingerprint, page.body, page.encoding)
+
+    data, header = await _async_parse_shared(page, host, keys, metrics)
+    # Copy: callers add derived keys to the dict
+    return InverterPage(dict(data), header, page.fingerprint, page.body, page.encoding)
+
+
+async def async_parse_page(ip_address: str, body: bytes, encoding: str, keys=None):
+    """Decode and parse a page fetched earlier (e.g. replayed from the page log)."""
+    host = _cache_key(ip_address)
+    return await _async_decode_and_parse(host, body, encoding, keys, metrics_for(host))
+
+
+async def async_get_raw_html(ip_address: str, hass=None, session=None) -> str:
+    """Return raw HTML from whichever endpoint is working."""
+    page = await _async_fetch_shared(ip_address, hass, session, use_breaker=False)
+    return page.body.decode(page.encoding)
+
+
+async def async_get_sensor_data(ip_address: str, hass=None, session=None):
+    """Fetch and parse inverter telemetry from the discovered working endpoint."""
+    page = await async_get_inverter_data(ip_address, hass, session, use_breaker=False)
+    return page.data
+
 
-    for part in output.split():
-        if ":" in part and len(part) == 17:
-            return part.strip()
+async def async_get_mac(ip_address: str, hass=None):
+    """Return MAC address for the device from the neighbour (ARP) table, if visible."""
+    from .neighbour import async_get_neighbour_table
 
-    return None
\ No newline at end of file
+    table = await async_get_neighbour_table(hass)
+    return table.by_ip.get(_cache_key(ip_address))
@@ -0,0 +1,31 @@
+"""Shared helpers for the Solutronic tests."""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+
+# Import the integration as custom_components.solutronic, like HA does
+sys.path.insert(0, ROOT)
+
+# Every page under fixtures/ is picked up; drop captured device pages in there too
+PAGE_FIXTURES = sorted(name for name in os.listdir(FIXTURES) if name.endswith(".html"))
+
+
+def load_page(name):
+    """Return a fixture page as text."""
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as page:
+        return page.read()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_schemas():
+    """Do not let a layout learned in one test leak into the next."""
+    from custom_components.solutronic import solutronic_api
+
+    solutronic_api._SCHEMAS.clear()
+    yield
+    solutronic_api._SCHEMAS.clear()
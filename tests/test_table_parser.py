@@ -0,0 +1,130 @@
+"""Parity of the fast table extractor with the BeautifulSoup fallback."""
+
+import tracemalloc
+
+import pytest
+
+from custom_components.solutronic.solutronic_api import (
+    _parse_rows_full,
+    _parse_sensor_table,
+    _parse_sensor_table_soup,
+    _split_table_rows,
+)
+
+from .conftest import PAGE_FIXTURES, load_page
+
+# Pages the fast extractor declines on purpose (BeautifulSoup decides instead)
+DECLINED = {"simulator_truncated.html"}
+
+_CELL_PAGE = (
+    "<html><body><table>"
+    "<tr><td>1</td><td>K</td><td>d</td><td>{cell}</td></tr>"
+    "<tr><td>2</td><td>ET</td><td>Energie heute</td><td>5,5&nbsp;</td></tr>"
+    "</table></body></html>"
+)
+
+# Cells where a naive extractor and html.parser disagree
+EDGE_CASES = {
+    "unknown_entity": "12&foo;3",
+    "entity_without_semicolon": "a&amp b&copy x",
+    "bare_less_than": "1 < 2",
+    "bare_less_than_before_digit": "a<3",
+    "cdata": "<![CDATA[7,5]]>",
+    "numeric_entities": "&#65;&#x42;",
+    "escaped_markup": "&lt;b&gt;",
+    "inline_markup": "<b>4,2</b>&nbsp;W",
+    "comment": "1<!-- x -->2",
+}
+
+
+class _Counters(dict):
+    def increment(self, counter, amount=1):
+        self[counter] = self.get(counter, 0) + amount
+
+
+def _fast(html):
+    rows = _split_table_rows(html)
+    if rows is None:
+        return None
+    parsed = _parse_rows_full(rows)
+    return parsed[0] if parsed is not None else None
+
+
+@pytest.mark.parametrize("name", sorted(set(PAGE_FIXTURES) - DECLINED))
+def test_fast_extractor_matches_soup(name):
+    html = load_page(name)
+    assert _fast(html) == _parse_sensor_table_soup(html)
+
+
+@pytest.mark.parametrize("name", sorted(DECLINED))
+def test_fast_extractor_declines_broken_markup(name):
+    html = load_page(name)
+    assert _fast(html) is None
+    assert _parse_sensor_table(html) == _parse_sensor_table_soup(html)
+
+
+@pytest.mark.parametrize("name", PAGE_FIXTURES)
+def test_learned_layout_matches_soup(name):
+    """The second parse of a page goes by learned row positions; same result."""
+    html = load_page(name)
+    expected = _parse_sensor_table_soup(html)
+    keys = frozenset(list(expected)[::2])
+
+    for _ in range(2):
+        assert _parse_sensor_table(html, firmware="1.0", host="fixture") == expected
+        assert _parse_sensor_table(html, keys=keys, firmware="1.0", host="fixture") == {
+            key: value for key, value in expected.items() if key in keys
+        }
+
+
+@pytest.mark.parametrize("change", ["rename", "swap"])
+def test_learned_layout_relearns_on_key_change(change):
+    """A page with the same row count but a different key column is not read by position."""
+    html = load_page("simulator_solplus100_day.html")
+    _parse_sensor_table(html, firmware="1.0", host="fixture")
+
+    if change == "rename":
+        changed = html.replace("<td>UDC1</td>", "<td>UDC9</td>", 1)
+    else:
+        changed = html.replace("<td>PACL1</td>", "<td>@</td>", 1)
+        changed = changed.replace("<td>PACL2</td>", "<td>PACL1</td>", 1).replace("<td>@</td>", "<td>PACL2</td>", 1)
+    assert changed != html
+
+    metrics = _Counters()
+    keys = frozenset(("PACL1", "PACL2", "ET"))
+    expected = _parse_sensor_table_soup(changed)
+    assert _parse_sensor_table(changed, metrics, keys, firmware="1.0", host="fixture") == {
+        key: value for key, value in expected.items() if key in keys
+    }
+    assert metrics == {"schema_mismatches": 1, "schemas_learned": 1}
+
+
+@pytest.mark.parametrize("cell", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_edge_cases_match_soup(cell):
+    """The fast path either agrees with BeautifulSoup or leaves the page to it."""
+    html = _CELL_PAGE.format(cell=cell)
+    expected = _parse_sensor_table_soup(html)
+    fast = _fast(html)
+    assert fast is None or fast == expected
+    assert _parse_sensor_table(html) == expected
+
+
+@pytest.mark.parametrize("cell", ["12&foo;3", "<![CDATA[7,5]]>"], ids=["unknown_entity", "cdata"])
+def test_known_divergences_fall_back(cell):
+    assert _fast(_CELL_PAGE.format(cell=cell)) is None
+
+
+def _peak_allocation(parse, html):
+    tracemalloc.start()
+    try:
+        parse(html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("name", sorted(set(PAGE_FIXTURES) - DECLINED))
+def test_fast_extractor_allocates_less(name):
+    html = load_page(name)
+    _parse_sensor_table_soup(html)  # bs4 import and its caches are not the parse's cost
+    assert _peak_allocation(_fast, html) < _peak_allocation(_parse_sensor_table_soup, html)
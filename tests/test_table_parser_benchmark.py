@@ -0,0 +1,52 @@
+"""Speed and allocations of the fast table extractor vs. BeautifulSoup.
+
+    python -m pytest tests/test_table_parser_benchmark.py --benchmark-group-by=param:name
+    python -m pytest --benchmark-skip   # everything but the benchmarks
+
+Peak allocation per parse is reported in each result's extra_info.
+"""
+
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from custom_components.solutronic.solutronic_api import (  # noqa: E402
+    _parse_rows_full,
+    _parse_sensor_table,
+    _parse_sensor_table_soup,
+    _split_table_rows,
+)
+
+from .conftest import PAGE_FIXTURES, load_page  # noqa: E402
+
+
+def _fast(html):
+    return _parse_rows_full(_split_table_rows(html))[0]
+
+
+def _learned(html):
+    # Production path after the first poll: only the integration's keys, by row position
+    return _parse_sensor_table(html, keys=frozenset(("PACL1", "PACL2", "PACL3", "ET", "EG")),
+                               firmware="1.0", host="benchmark")
+
+
+PARSERS = {"fast": _fast, "learned": _learned, "soup": _parse_sensor_table_soup}
+BENCHMARKED = [name for name in PAGE_FIXTURES if _split_table_rows(load_page(name)) is not None]
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("name", BENCHMARKED)
+def test_parse_speed(benchmark, name, parser):
+    html = load_page(name)
+    parse = PARSERS[parser]
+    parse(html)  # warm up (bs4 import, learned layout)
+
+    tracemalloc.start()
+    parse(html)
+    benchmark.extra_info["peak_alloc_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    benchmark.group = name
+    benchmark(parse, html)
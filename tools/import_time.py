@@ -0,0 +1,104 @@
+"""Import-time benchmark and regression guard for the integration.
+
+Imports the integration's modules in fresh interpreters (with the Home
+Assistant modules it builds on already loaded, as they are when HA sets up an
+integration) and reports the median import time. Fails when a module that
+must load lazily (HTML fallback parser, discovery, ARP tooling) is pulled in
+at import time, or when the median exceeds --budget-ms.
+
+    python tools/import_time.py --runs 7 --budget-ms 25
+
+Requires homeassistant to be installed (as in a HA dev environment).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded by Home Assistant before our integration is imported
+PRELOADED = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.sensor",
+    "homeassistant.components.diagnostics",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.sun",
+    "homeassistant.helpers.update_coordinator",
+)
+
+# What HA imports when it sets up the integration
+INTEGRATION_MODULES = (
+    "custom_components.solutronic",
+    "custom_components.solutronic.sensor",
+    "custom_components.solutronic.config_flow",
+    "custom_components.solutronic.diagnostics",
+)
+
+# Must not be imported by the integration before first needed (HA itself may
+# already have loaded some of them, e.g. ifaddr; those do not count)
+LAZY_MODULES = (
+    "bs4",
+    "ifaddr",
+    "custom_components.solutronic.discovery",
+    "custom_components.solutronic.neighbour",
+    "custom_components.solutronic.longterm",
+)
+
+_PROBE = """
+import importlib, json, sys, time
+for name in {preloaded!r}:
+    importlib.import_module(name)
+already = set(sys.modules)
+started = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+elapsed = (time.perf_counter() - started) * 1000
+eager = [m for m in {lazy!r} if m in sys.modules and m not in already]
+print(json.dumps({{"ms": elapsed, "eager": eager}}))
+"""
+
+
+def _measure_once():
+    code = _PROBE.format(preloaded=PRELOADED, modules=INTEGRATION_MODULES, lazy=LAZY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if the median exceeds this")
+    args = parser.parse_args()
+
+    results = [_measure_once() for _ in range(args.runs)]
+    times = [result["ms"] for result in results]
+    eager = sorted({module for result in results for module in result["eager"]})
+
+    print(f"integration import  median {statistics.median(times):.1f} ms "
+          f"(min {min(times):.1f}, max {max(times):.1f}, {args.runs} runs)")
+    print(f"loaded eagerly      {', '.join(eager) if eager else 'none of the lazy modules'}")
+
+    failed = False
+    if eager:
+        print("FAIL: modules that should load lazily were imported at startup")
+        failed = True
+    if args.budget_ms is not None and statistics.median(times) > args.budget_ms:
+        print(f"FAIL: median import time above budget of {args.budget_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Load harness: drive N simulated inverters through the real coordinator.
+
+Starts a fleet from tools/simulator.py, runs one SolutronicDataUpdateCoordinator
+per inverter under a shared SolutronicHub inside a minimal Home Assistant
+instance, and reports throughput, p50/p99 poll latency and event-loop lag.
+
+    python tools/loadtest.py --inverters 20 --interval 5 --duration 60
+
+Requires homeassistant to be installed (as in a HA dev environment).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.solutronic.coordinator import SolutronicDataUpdateCoordinator  # noqa: E402
+from custom_components.solutronic.hub import SolutronicHub  # noqa: E402
+from simulator import InverterProfile, start_fleet  # noqa: E402
+
+LAG_PERIOD = 0.05  # seconds between event-loop lag probes
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def _measure_loop_lag(samples):
+    """Record how late a periodic timer fires; a busy loop shows up as lag."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(LAG_PERIOD)
+        samples.append((loop.time() - started - LAG_PERIOD) * 1000)
+
+
+async def run(args):
+    def profile(index):
+        return InverterProfile(
+            latency=args.latency,
+            jitter=args.jitter,
+            timeout_rate=args.timeout_rate,
+            truncate_rate=args.truncate_rate,
+            speed=args.speed,
+            start_hour=12,
+            extra_rows=args.extra_rows,
+            serial=2091 + index,
+            seed=index,
+        )
+
+    inverters = await start_fleet(args.inverters, profile)
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.latitude, hass.config.longitude = 55.7, 12.5
+    hub = SolutronicHub(hass)
+
+    coordinators = []
+    latencies = []
+    for index, inverter in enumerate(inverters):
+        coordinator = SolutronicDataUpdateCoordinator(
+            hass, inverter.host, args.interval, hub=hub, max_interval=args.interval
+        )
+        hub.async_register(f"load{index}", coordinator)
+        coordinators.append(coordinator)
+
+    lag_samples = []
+    lag_task = asyncio.ensure_future(_measure_loop_lag(lag_samples))
+    started = time.monotonic()
+    await asyncio.sleep(args.duration)
+    elapsed = time.monotonic() - started
+    lag_task.cancel()
+
+    polls = failures = created = reused = inline = offloaded = 0
+    for coordinator in coordinators:
+        counters = coordinator.metrics.counters
+        polls += counters.get("polls", 0)
+        failures += counters.get("failures", 0)
+        created += counters.get("connections_created", 0)
+        reused += counters.get("connections_reused", 0)
+        inline += counters.get("parse_inline", 0)
+        offloaded += counters.get("parse_offloaded", 0)
+        histogram = coordinator.metrics.stages.get("update")
+        if histogram is not None:
+            latencies.extend(histogram.recent)
+
+    for index, coordinator in enumerate(coordinators):
+        await hub.async_unregister(f"load{index}")
+        await coordinator.async_shutdown()
+    for inverter in inverters:
+        await inverter.stop()
+    await hass.async_stop(force=True)
+
+    requests = sum(inverter.counters.requests for inverter in inverters)
+    print(f"inverters          {args.inverters}")
+    print(f"duration           {elapsed:.1f} s")
+    print(f"polls              {polls} ({polls / elapsed:.2f}/s), failures {failures}")
+    print(f"device requests    {requests} ({requests / elapsed:.2f}/s)")
+    reuse_rate = f"{reused / (created + reused):.1%}" if created + reused else "n/a"
+    print(f"connections        {created} created, {reused} reused ({reuse_rate})")
+    print(f"parsing            {inline} inline, {offloaded} in the parse pool")
+    print(f"poll latency p50   {_format_ms(_percentile(latencies, 0.5))}")
+    print(f"poll latency p99   {_format_ms(_percentile(latencies, 0.99))}")
+    print(f"loop lag p50/p99   {_format_ms(_percentile(lag_samples, 0.5))} / {_format_ms(_percentile(lag_samples, 0.99))}")
+    print(f"loop lag max       {_format_ms(max(lag_samples) if lag_samples else None)}")
+
+
+def _format_ms(value):
+    return "n/a" if value is None else f"{value:.2f} ms"
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--inverters", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=5, help="poll interval in seconds")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated device latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--extra-rows", type=int, default=0, help="unused filler rows per page")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(_parse_args()))
@@ -0,0 +1,121 @@
+"""Replay recorded inverter pages through the parser and the coordinator.
+
+Reads the segments written by the integration's page log (enable "Record raw
+inverter pages" in the options; files land in <config>/solutronic_pages/) and
+feeds every page through the same decode/parse path as a live poll, then
+through SolutronicDataUpdateCoordinator's post-processing. Pages are replayed
+as fast as possible by default, or at the recorded pace scaled by --speed.
+The coordinator sees the recorded timestamps as its clock either way, so
+energy integration and rolling statistics come out as they did live.
+
+    python tools/replay.py /config/solutronic_pages --entry 01HX... --speed 10
+    python tools/replay.py pages/ --dump parsed.jsonl   # diff this between parser versions
+
+Requires homeassistant to be installed (as in a HA dev environment).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.solutronic import coordinator as coordinator_module  # noqa: E402
+from custom_components.solutronic.coordinator import (  # noqa: E402
+    TABLE_KEYS,
+    SolutronicDataUpdateCoordinator,
+)
+from custom_components.solutronic.pagelog import iter_log  # noqa: E402
+from custom_components.solutronic.solutronic_api import InverterPage, async_parse_page  # noqa: E402
+
+REPLAY_HOST = "replay.invalid"
+
+
+class ReplayCoordinator(SolutronicDataUpdateCoordinator):
+    """Coordinator whose fetch returns the current recorded page instead of polling."""
+
+    def __init__(self, hass):
+        super().__init__(hass, REPLAY_HOST, 5)
+        self.record = None
+
+    async def async_request_page(self, previous_fingerprint=None):
+        record = self.record
+        if record.fingerprint == previous_fingerprint:
+            return InverterPage(None, None, record.fingerprint, record.body, record.encoding)
+        data, header = await async_parse_page(REPLAY_HOST, record.body, record.encoding, TABLE_KEYS)
+        return InverterPage(data, header, record.fingerprint, record.body, record.encoding)
+
+
+async def run(args):
+    hass = HomeAssistant(tempfile.mkdtemp())
+    hass.config.latitude, hass.config.longitude = 55.7, 12.5
+    coordinator = ReplayCoordinator(hass)
+
+    # The coordinator reads wall-clock and monotonic time itself; give it the
+    # recorded timestamps instead so time-dependent values match the recording
+    now = [0.0]
+    coordinator_module.time = SimpleNamespace(
+        time=lambda: now[0], monotonic=lambda: now[0], perf_counter=time.perf_counter
+    )
+
+    dump = open(args.dump, "w", encoding="utf-8") if args.dump else None
+    polls = changed = 0
+    first = started = None
+    try:
+        for record in iter_log(args.directory, args.entry):
+            if args.limit and polls >= args.limit:
+                break
+            if first is None:
+                first, started = record.timestamp, time.monotonic()
+            elif args.speed:
+                # Recorded pace, scaled
+                delay = (record.timestamp - first) / args.speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            now[0] = record.timestamp
+            coordinator.record = record
+            previous = coordinator._last_fingerprint
+            data = await coordinator._async_update_data()
+            polls += 1
+            changed += record.fingerprint != previous
+
+            if dump is not None:
+                dump.write(json.dumps({"timestamp": record.timestamp, "data": data}, sort_keys=True, default=str))
+                dump.write("\n")
+    finally:
+        if dump is not None:
+            dump.close()
+
+    elapsed = time.monotonic() - started if started is not None else 0.0
+    recorded = record.timestamp - first if first is not None else 0.0
+    metrics = coordinator.metrics.as_dict()
+    print(f"polls replayed     {polls} ({changed} changed pages)")
+    print(f"recorded span      {recorded:.0f} s, replayed in {elapsed:.2f} s")
+    for stage in ("decode", "parse", "postprocess", "update"):
+        summary = metrics["stages"].get(stage)
+        if summary:
+            print(f"{stage:<18} p50 {summary['p50_ms']:.3f} ms  p99 {summary['p99_ms']:.3f} ms")
+    print(f"counters           {metrics['counters']}")
+    print(f"last data          {coordinator._last_data}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="page log directory (<config>/solutronic_pages)")
+    parser.add_argument("--entry", default=None, help="config entry id to replay (default: all segments)")
+    parser.add_argument("--speed", type=float, default=0.0, help="replay pace vs. recording (0 = max speed)")
+    parser.add_argument("--limit", type=int, default=0, help="stop after this many polls")
+    parser.add_argument("--dump", default=None, help="write the coordinator data per poll as JSON lines")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
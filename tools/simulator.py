@@ -0,0 +1,312 @@
+"""Local fake Solutronic SOLPLUS web server for development and load tests.
+
+Each simulated inverter binds its own loopback address (127.0.0.2, 127.0.0.3,
+...) so the integration sees distinct hosts, and serves the same kind of table
+page as the real device on configurable ports/paths (by default 8888
+/solutronic/ and 80 /).
+
+    python tools/simulator.py --count 3 --latency 0.05 --speed 60
+
+Faults can be injected per inverter: extra latency and jitter, requests that
+never answer (timeouts), truncated bodies, and moving to another port while
+running. PAC follows a diurnal curve with passing clouds; ET/EG integrate it.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+DEFAULT_PORTS = (8888, 80)
+DEFAULT_PATHS = ("/solutronic/", "/")
+
+# Keys in table order; the real page carries more rows than the integration reads
+_TABLE_KEYS = (
+    ("PAC", "AC-Leistung"),
+    ("PACL1", "AC-Leistung L1"),
+    ("PACL2", "AC-Leistung L2"),
+    ("PACL3", "AC-Leistung L3"),
+    ("UDC1", "DC-Spannung 1"),
+    ("UDC2", "DC-Spannung 2"),
+    ("UDC3", "DC-Spannung 3"),
+    ("IDC1", "DC-Strom 1"),
+    ("IDC2", "DC-Strom 2"),
+    ("IDC3", "DC-Strom 3"),
+    ("UACL1", "Netzspannung L1"),
+    ("UACL2", "Netzspannung L2"),
+    ("UACL3", "Netzspannung L3"),
+    ("ET", "Energie heute"),
+    ("EG", "Energie gesamt"),
+    ("MAXP", "Max. Leistung heute"),
+    ("ETA", "Wirkungsgrad"),
+    ("SN", "Seriennummer"),
+    ("STAT", "Status"),
+)
+
+_PAGE = """<html>
+<head><title>SOLPLUS</title></head>
+<body>
+<h1>{model}<br>Solutronic AG</h1>
+<p>FW-Release: {firmware}</p>
+<table border="1">
+<tr><th>Nr.</th><th>Name</th><th>Beschreibung</th><th>Wert</th></tr>
+{rows}
+</table>
+</body>
+</html>
+"""
+
+
+@dataclass
+class InverterProfile:
+    """Behaviour of one simulated inverter."""
+
+    peak_w: float = 10000.0
+    phases: int = 3
+    strings: int = 2
+    model: str = "SOLPLUS 100"
+    firmware: str = "2.1.4"
+    serial: int = 2091
+    ports: tuple = DEFAULT_PORTS
+    paths: tuple = DEFAULT_PATHS
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # uniform +/- seconds on top of latency
+    timeout_rate: float = 0.0  # fraction of requests that never answer
+    truncate_rate: float = 0.0  # fraction of responses cut off mid-body
+    speed: float = 1.0  # simulated seconds per real second
+    start_hour: float = None  # simulated local hour at start (default: real clock)
+    seed: int = None
+    eg_start: float = 12000.0  # kWh
+    extra_rows: int = 0  # unused filler rows, to simulate large pages
+
+
+@dataclass
+class _Counters:
+    requests: int = 0
+    timeouts: int = 0
+    truncated: int = 0
+    by_path: dict = field(default_factory=dict)
+
+
+class SimulatedInverter:
+    """One fake inverter: a small aiohttp app bound to a host and a set of ports."""
+
+    def __init__(self, host, profile=None):
+        self.host = host
+        self.profile = profile or InverterProfile()
+        self.counters = _Counters()
+        self._random = random.Random(self.profile.seed)
+        self._runner = None
+        self._sites = {}
+        self._served_ports = ()
+
+        # Simulated clock and energy state
+        self._real_start = time.monotonic()
+        local = time.localtime()
+        hour = self.profile.start_hour
+        self._sim_start = (hour if hour is not None else local.tm_hour + local.tm_min / 60) * 3600
+        self._last_sim = self._sim_start
+        self._et = 0.0
+        self._eg = self.profile.eg_start
+        self._maxp = 0.0
+        self._cloud = 1.0
+
+    # ---- Lifecycle ----
+
+    async def start(self, ports=None):
+        """Start serving on the given ports (default: the profile's ports)."""
+        app = web.Application()
+        for path in self.profile.paths:
+            app.router.add_get(path, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await self._bind(ports or self.profile.ports)
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._sites = {}
+
+    async def move(self, ports):
+        """Stop listening on the current ports and serve on new ones instead."""
+        for site in self._sites.values():
+            await site.stop()
+        self._sites = {}
+        await self._bind(ports)
+
+    async def _bind(self, ports):
+        for port in ports:
+            site = web.TCPSite(self._runner, self.host, port)
+            await site.start()
+            self._sites[port] = site
+        self._served_ports = tuple(ports)
+
+    # ---- Request handling ----
+
+    async def _handle(self, request):
+        profile = self.profile
+        self.counters.requests += 1
+        self.counters.by_path[request.path] = self.counters.by_path.get(request.path, 0) + 1
+
+        delay = profile.latency + self._random.uniform(-profile.jitter, profile.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < profile.timeout_rate:
+            self.counters.timeouts += 1
+            await asyncio.sleep(3600)
+
+        body = self.page().encode("iso-8859-1")
+
+        if self._random.random() < profile.truncate_rate:
+            self.counters.truncated += 1
+            response = web.StreamResponse(headers={"Content-Type": "text/html; charset=iso-8859-1"})
+            response.content_length = len(body)
+            try:
+                await response.prepare(request)
+                await response.write(body[: len(body) // 2])
+            except ConnectionResetError:
+                pass  # client already gave up
+            if request.transport is not None:
+                request.transport.close()
+            return response
+
+        return web.Response(body=body, content_type="text/html", charset="iso-8859-1")
+
+    # ---- Simulated device ----
+
+    def _sim_seconds(self):
+        return self._sim_start + (time.monotonic() - self._real_start) * self.profile.speed
+
+    def _diurnal_pac(self, sim_seconds):
+        """Clear-sky bell between 06:00 and 20:00 with a random-walk cloud factor."""
+        hour = (sim_seconds / 3600) % 24
+        if not 6 <= hour <= 20:
+            return 0.0
+        clear = math.sin(math.pi * (hour - 6) / 14) ** 1.5
+        self._cloud = min(1.0, max(0.2, self._cloud + self._random.uniform(-0.05, 0.05)))
+        return self.profile.peak_w * clear * self._cloud
+
+    def _advance(self):
+        """Advance energy counters to the current simulated time and return PAC."""
+        now = self._sim_seconds()
+        previous, self._last_sim = self._last_sim, now
+        if int(now // 86400) != int(previous // 86400):
+            self._et = 0.0
+            self._maxp = 0.0
+        pac = self._diurnal_pac(now)
+        kwh = pac * (now - previous) / 3_600_000
+        self._et += kwh
+        self._eg += kwh
+        self._maxp = max(self._maxp, pac)
+        return pac
+
+    def values(self):
+        """Return the current table values."""
+        profile = self.profile
+        pac = self._advance()
+        values = {"PAC": pac, "ET": self._et, "EG": self._eg, "MAXP": self._maxp}
+
+        for phase in (1, 2, 3):
+            if phase <= profile.phases:
+                values[f"PACL{phase}"] = pac / profile.phases
+                values[f"UACL{phase}"] = 230 + self._random.uniform(-2, 2)
+
+        dc_power = pac / 0.97 if pac else 0.0
+        for string in range(1, profile.strings + 1):
+            udc = (550 + self._random.uniform(-3, 3)) if pac else 0.0
+            values[f"UDC{string}"] = udc
+            values[f"IDC{string}"] = dc_power / profile.strings / udc if udc else 0.0
+
+        values["ETA"] = 97.0 if pac else 0.0
+        values["SN"] = profile.serial
+        values["STAT"] = "MPP" if pac else "Nacht"
+        return values
+
+    def page(self):
+        """Render the inverter page for the current simulated state."""
+        values = self.values()
+        rows = []
+        for index, (key, description) in enumerate(_TABLE_KEYS, start=1):
+            if key not in values:
+                continue
+            value = values[key]
+            if isinstance(value, float):
+                value = f"{value:.1f}".replace(".", ",")
+            rows.append(f"<tr><td>{index}</td><td>{key}</td><td>{description}</td><td>{value}&nbsp;</td></tr>")
+        for index in range(len(_TABLE_KEYS) + 1, len(_TABLE_KEYS) + 1 + self.profile.extra_rows):
+            rows.append(f"<tr><td>{index}</td><td>X{index}</td><td>Reserve</td><td>---&nbsp;</td></tr>")
+        return _PAGE.format(model=self.profile.model, firmware=self.profile.firmware, rows="\n".join(rows))
+
+
+async def start_fleet(count, profile_factory=None, first_host=2):
+    """Start count simulated inverters on 127.0.0.<first_host>... and return them."""
+    inverters = []
+    for index in range(count):
+        profile = profile_factory(index) if profile_factory else InverterProfile(seed=index)
+        inverter = SimulatedInverter(f"127.0.0.{first_host + index}", profile)
+        await inverter.start()
+        inverters.append(inverter)
+    return inverters
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1, help="number of simulated inverters")
+    parser.add_argument("--ports", type=int, nargs="+", default=list(DEFAULT_PORTS))
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +/- seconds of latency")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of requests never answered")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="fraction of bodies cut off")
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument("--start-hour", type=float, default=None, help="simulated hour of day at start")
+    parser.add_argument("--extra-rows", type=int, default=0, help="unused filler rows per page")
+    parser.add_argument("--move-after", type=float, default=None,
+                        help="seconds after which every inverter moves to the next port in --ports")
+    return parser.parse_args()
+
+
+async def _main(args):
+    def profile(index):
+        return InverterProfile(
+            ports=tuple(args.ports[:1]) if args.move_after else tuple(args.ports),
+            paths=tuple(args.paths),
+            latency=args.latency,
+            jitter=args.jitter,
+            timeout_rate=args.timeout_rate,
+            truncate_rate=args.truncate_rate,
+            speed=args.speed,
+            start_hour=args.start_hour,
+            extra_rows=args.extra_rows,
+            serial=2091 + index,
+            seed=index,
+        )
+
+    inverters = await start_fleet(args.count, profile)
+    for inverter in inverters:
+        print(f"Serving {inverter.host} on ports {inverter._served_ports}")
+
+    try:
+        if args.move_after:
+            await asyncio.sleep(args.move_after)
+            for inverter in inverters:
+                await inverter.move(tuple(args.ports[1:2]) or tuple(args.ports))
+                print(f"{inverter.host} moved to ports {inverter._served_ports}")
+        await asyncio.Event().wait()
+    finally:
+        for inverter in inverters:
+            await inverter.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(_parse_args()))
+    except KeyboardInterrupt:
+        pass